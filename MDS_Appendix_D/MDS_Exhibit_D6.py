@@ -1,41 +1,236 @@
 # Evaluating Predictive Accuracy of a Binary Classifier (Python)
 
-def evaluate_classifier(predicted, observed):
-    import pandas as pd 
-    if(len(predicted) != len(observed)):
-        print('\nevaluate_classifier error:',\
-             ' predicted and observed must be the same length\n')
-        return(None) 
-    if(len(set(predicted)) != 2):
-        print('\nevaluate_classifier error:',\
-              ' predicted must be binary\n')
-        return(None)          
-    if(len(set(observed)) != 2):
-        print('\nevaluate_classifier error:',\
-              ' observed must be binary\n')
-        return(None)          
-
-    predicted_data = predicted
-    observed_data = observed
-    input_data = {'predicted': predicted_data,'observed':observed_data}
-    input_data_frame = pd.DataFrame(input_data)
-    
-    cmat = pd.crosstab(input_data_frame['predicted'],\
-        input_data_frame['observed']) 
-    a = float(cmat.ix[0,0])
-    b = float(cmat.ix[0,1])
-    c = float(cmat.ix[1,0]) 
-    d = float(cmat.ix[1,1])
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# default number of observations per chunk when streaming over
+# large or memory-mapped arrays of predictions
+DEFAULT_CHUNK_SIZE = 1000000
+
+# encode a binary vector as 0/1 codes in one vectorized pass
+# returns sorted tuple of the distinct values (one or two of them)
+# and the integer codes, or None if there are more than two values
+def binary_codes(values):
+    values = np.asarray(values)
+    if len(values) == 0:
+        return((), np.zeros(0, dtype = np.intp))
+    first = values[0]
+    is_first = (values == first)
+    if is_first.all():
+        return((first,), np.zeros(len(values), dtype = np.intp))
+    second = values[np.argmin(is_first)]  # first value not equal to first
+    if np.count_nonzero(is_first | (values == second)) != len(values):
+        return(None)
+    if first < second:
+        return((first, second), (~is_first).astype(np.intp))
+    return((second, first), is_first.astype(np.intp))
+
+# confusion matrix counts keyed by (predicted, observed) label pairs
+# for one chunk of encoded labels... a single bincount over the codes
+def confusion_counts(predicted_encoding, observed_encoding):
+    predicted_labels, predicted_codes = predicted_encoding
+    observed_labels, observed_codes = observed_encoding
+    counts = np.bincount(2 * predicted_codes + observed_codes,\
+        minlength = 4)
+    cell_counts = {}
+    for i, predicted_label in enumerate(predicted_labels):
+        for j, observed_label in enumerate(observed_labels):
+            cell_counts[(predicted_label, observed_label)] =\
+                int(counts[2 * i + j])
+    return(cell_counts)
+
+# split predicted and observed sequences (including numpy memmap arrays)
+# into aligned chunks without copying the full inputs
+def iterate_chunks(predicted, observed, chunk_size = DEFAULT_CHUNK_SIZE):
+    predicted = np.asarray(predicted)
+    observed = np.asarray(observed)
+    for begin in range(0, len(predicted), chunk_size):
+        end = begin + chunk_size
+        yield(predicted[begin:end], observed[begin:end])
+
+# the eleven summary statistics computed from confusion matrix counts
+def classifier_statistics(a, b, c, d):
+    a, b, c, d = float(a), float(b), float(c), float(d)
     n = a + b + c + d
     predictive_accuracy = (a + d)/n
     true_positive_rate = a / (a + c)
     false_positive_rate = b / (b + d)
     precision = a / (a + b)
-    specificity = 1 - false_positive_rate   
+    specificity = 1 - false_positive_rate
     expected_accuracy = (((a + b)*(a + c)) + ((b + d)*(c + d)))/(n * n)
     kappa = (predictive_accuracy - expected_accuracy)\
-       /(1 - expected_accuracy)   
+       /(1 - expected_accuracy)
     return(a, b, c, d, predictive_accuracy, true_positive_rate, specificity,\
         false_positive_rate, precision, expected_accuracy, kappa)
 
-            
+# evaluate from an iterable of (predicted, observed) chunks
+# counts are accumulated chunk by chunk so memory use stays bounded
+def evaluate_classifier_chunks(chunks):
+    cell_counts = {}
+    for predicted, observed in chunks:
+        if(len(predicted) != len(observed)):
+            print('\nevaluate_classifier error:',\
+                 ' predicted and observed must be the same length\n')
+            return(None)
+        predicted_encoding = binary_codes(predicted)
+        if predicted_encoding is None:
+            print('\nevaluate_classifier error:',\
+                  ' predicted must be binary\n')
+            return(None)
+        observed_encoding = binary_codes(observed)
+        if observed_encoding is None:
+            print('\nevaluate_classifier error:',\
+                  ' observed must be binary\n')
+            return(None)
+        chunk_counts = confusion_counts(predicted_encoding, observed_encoding)
+        for key, count in chunk_counts.items():
+            cell_counts[key] = cell_counts.get(key, 0) + count
+    predicted_labels = sorted(set(key[0] for key in cell_counts))
+    observed_labels = sorted(set(key[1] for key in cell_counts))
+    if(len(predicted_labels) != 2):
+        print('\nevaluate_classifier error:',\
+              ' predicted must be binary\n')
+        return(None)
+    if(len(observed_labels) != 2):
+        print('\nevaluate_classifier error:',\
+              ' observed must be binary\n')
+        return(None)
+    # rows of the confusion matrix are predicted, columns are observed
+    # with labels in sorted order (as with pandas crosstab)
+    a, b, c, d = [cell_counts.get((i, j), 0)\
+        for i in predicted_labels for j in observed_labels]
+    return(classifier_statistics(a, b, c, d))
+
+def evaluate_classifier(predicted, observed, chunk_size = None):
+    if(len(predicted) != len(observed)):
+        print('\nevaluate_classifier error:',\
+             ' predicted and observed must be the same length\n')
+        return(None)
+    if chunk_size is None:
+        chunk_size = max(len(predicted), 1)
+    return(evaluate_classifier_chunks(\
+        iterate_chunks(predicted, observed, chunk_size)))
+
+# ---------------------------------------------------
+# Sweep of probability cutoffs in one sorted pass
+# ---------------------------------------------------
+# predicted response is positive when score > cutoff (as in prob_to_pred)
+# and observed response is positive when equal to the positive label.
+# scores are sorted once, then counts for every distinct cutoff come
+# from cumulative sums... O(n log n) for all cutoffs together.
+# rows are ordered from the highest cutoff (no positive predictions)
+# to a final cutoff of -inf (all predictions positive).
+def sweep_cutoffs(scores, observed, positive = 1):
+    scores = np.asarray(scores, dtype = np.float64)
+    observed = np.asarray(observed)
+    if(len(scores) != len(observed)):
+        print('\nsweep_cutoffs error:',\
+             ' scores and observed must be the same length\n')
+        return(None)
+    order = np.argsort(-scores, kind = 'mergesort')
+    sorted_scores = scores[order]
+    cumulative_positives = np.concatenate(([0],\
+        np.cumsum(observed[order] == positive)))
+    # index of first occurrence of each distinct score
+    starts = np.flatnonzero(np.concatenate(([True],\
+        sorted_scores[1:] != sorted_scores[:-1])))
+    n = len(scores)
+    predicted_positive = np.append(starts, n)
+    tp = cumulative_positives[predicted_positive]
+    fp = predicted_positive - tp
+    fn = cumulative_positives[-1] - tp
+    tn = (n - cumulative_positives[-1]) - fp
+    cutoff = np.append(sorted_scores[starts], -np.inf)
+    return(cutoff_statistics(cutoff, tp, fp, fn, tn))
+
+# vectorized statistics for arrays of counts, one entry per cutoff
+def cutoff_statistics(cutoff, tp, fp, fn, tn):
+    tp, fp, fn, tn = [np.asarray(x, dtype = np.float64)\
+        for x in (tp, fp, fn, tn)]
+    n = tp + fp + fn + tn
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        accuracy = (tp + tn) / n
+        true_positive_rate = tp / (tp + fn)
+        false_positive_rate = fp / (fp + tn)
+        precision = tp / (tp + fp)
+        expected_accuracy =\
+            ((tp + fp) * (tp + fn) + (fn + tn) * (fp + tn)) / (n * n)
+        kappa = (accuracy - expected_accuracy) / (1 - expected_accuracy)
+    return({'cutoff': np.asarray(cutoff, dtype = np.float64),
+        'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+        'accuracy': accuracy,
+        'true_positive_rate': true_positive_rate,
+        'false_positive_rate': false_positive_rate,
+        'precision': precision,
+        'kappa': kappa})
+
+# look up sweep results for arbitrary cutoff values (binary search)
+# the row used is the first one whose cutoff is at or below the value
+def sweep_at(sweep, cutoffs):
+    cutoffs = np.atleast_1d(np.asarray(cutoffs, dtype = np.float64))
+    rows = np.searchsorted(-sweep['cutoff'], -cutoffs, side = 'left')
+    selected = dict((key, values[rows]) for key, values in sweep.items())
+    selected['cutoff'] = cutoffs
+    return(selected)
+
+# cutoff maximizing a statistic from the sweep
+# statistic is a key of the sweep or 'youden' (true minus false positive rate)
+def best_cutoff(sweep, statistic = 'kappa'):
+    if statistic == 'youden':
+        values = sweep['true_positive_rate'] - sweep['false_positive_rate']
+    else:
+        values = sweep[statistic]
+    values = np.where(np.isnan(values), -np.inf, values)
+    row = int(np.argmax(values))
+    return(sweep['cutoff'][row], values[row])
+
+# ---------------------------------------------------
+# Evaluation of many classifiers in one pass
+# ---------------------------------------------------
+# predicted_matrix has one row of predictions per classifier, all
+# using the same pair of labels... counts for every row come from a
+# single bincount over row offsets plus encoded labels
+# returns a list with the eleven statistics for each row (None for a
+# row that does not predict both labels, and None for every row when
+# the inputs cannot be evaluated)
+def evaluate_classifiers(predicted_matrix, observed):
+    predicted_matrix = np.atleast_2d(np.asarray(predicted_matrix))
+    n_rows, n = predicted_matrix.shape
+    if(n != len(observed)):
+        print('\nevaluate_classifiers error:',\
+             ' predicted rows and observed must be the same length\n')
+        return([None] * n_rows)
+    predicted_encoding = binary_codes(predicted_matrix.ravel())
+    observed_encoding = binary_codes(observed)
+    if observed_encoding is None or len(observed_encoding[0]) != 2:
+        print('\nevaluate_classifiers error:',\
+              ' observed must be binary\n')
+        return([None] * n_rows)
+    # when all rows predict one label (as from a majority-class model),
+    # code it against the observed pair of labels
+    if predicted_encoding is not None and\
+        len(predicted_encoding[0]) == 1 and\
+        predicted_encoding[0][0] in observed_encoding[0]:
+        predicted_encoding = (observed_encoding[0], predicted_encoding[1] +\
+            list(observed_encoding[0]).index(predicted_encoding[0][0]))
+    if predicted_encoding is None or len(predicted_encoding[0]) != 2:
+        print('\nevaluate_classifiers error:',\
+              ' predicted must be binary\n')
+        return([None] * n_rows)
+    cell = 2 * predicted_encoding[1].reshape(n_rows, n) +\
+        observed_encoding[1]
+    cell = cell + 4 * np.arange(n_rows)[:, np.newaxis]
+    counts = np.bincount(cell.ravel(), minlength = 4 * n_rows).\
+        reshape(n_rows, 4)
+    results = []
+    for row in range(n_rows):
+        a, b, c, d = counts[row]
+        if (a + b) == 0 or (c + d) == 0:
+            print('\nevaluate_classifiers error:',\
+                  ' predicted row', row, 'must be binary\n')
+            results.append(None)
+        else:
+            results.append(classifier_statistics(a, b, c, d))
+    return(results)
@@ -10,6 +10,9 @@ import statsmodels.api as sm  # statistical models (including regression)
 import statsmodels.formula.api as smf  # R-like model specification
 from patsy.contrasts import Sum
 
+# import user-defined module
+import conjoint
+
 # read in conjoint survey profiles with respondent ranks
 conjoint_data_frame = pd.read_csv('mobile_services_ranking.csv')
 
@@ -27,26 +30,17 @@ print(main_effects_model_fit.summary())
 conjoint_attributes = ['brand', 'startup', 'monthly', 'service', \
     'retail', 'apple', 'samsung', 'google']
 
-# build part-worth information one attribute at a time
-level_name = []
-part_worth = []
-part_worth_range = []
-end = 1  # initialize index for coefficient in params
-for item in conjoint_attributes:
-    nlevels = len(list(unique(conjoint_data_frame[item])))
-    level_name.append(list(unique(conjoint_data_frame[item]))) 
-    begin = end 
-    end = begin + nlevels - 1
-    new_part_worth = list(main_effects_model_fit.params[begin:end])
-    new_part_worth.append((-1) * sum(new_part_worth))  
-    part_worth_range.append(max(new_part_worth) - min(new_part_worth))  
-    part_worth.append(new_part_worth)   
-    # end set to begin next iteration
-    
+# effects-coded design and its pseudo-inverse are built once for the
+# profiles... part-worths for one respondent (or for a matrix of
+# rankings with one column per respondent) are one matrix multiply
+conjoint_design = conjoint.ConjointDesign(conjoint_data_frame,\
+    conjoint_attributes)
+level_name = conjoint_design.levels
+part_worth = conjoint_design.part_worths(conjoint_data_frame['ranking'])
+
 # compute attribute relative importance values from ranges
-attribute_importance = []
-for item in part_worth_range:
-    attribute_importance.append(round(100 * (item / sum(part_worth_range)),2))
+attribute_importance = np.round(\
+    conjoint_design.importances(None, part_worths = part_worth), 2)
     
 # user-defined dictionary for printing descriptive attribute names     
 effect_name_dict = {'brand' : 'Mobile Service Provider', \
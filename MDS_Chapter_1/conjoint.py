@@ -0,0 +1,59 @@
+# Conjoint Part-Worths and Attribute Importance (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# main-effects conjoint design for a set of product profiles
+# each attribute is effects coded (sum contrasts, as with C(x, Sum) in a
+# model formula): levels are sorted, and the column for each level but
+# the last is 1 for that level, -1 for the last level, and 0 otherwise
+# the design and its pseudo-inverse are computed once, so least-squares
+# coefficients for any number of respondents who rank the same profiles
+# are one matrix multiply
+class ConjointDesign(object):
+
+    def __init__(self, profiles, attributes):
+        self.attributes = list(attributes)
+        self.levels = []
+        columns = [np.ones(len(profiles))]
+        self.slices = []
+        begin = 1  # column 0 is the intercept
+        for attribute in self.attributes:
+            values = np.asarray(profiles[attribute])
+            levels, codes = np.unique(values, return_inverse = True)
+            self.levels.append(list(levels))
+            coded = (codes[:, np.newaxis] ==\
+                np.arange(len(levels) - 1)[np.newaxis, :]).astype(np.float64)
+            coded[codes == len(levels) - 1] = -1
+            columns.extend(coded.T)
+            self.slices.append(slice(begin, begin + len(levels) - 1))
+            begin = begin + len(levels) - 1
+        self.design = np.column_stack(columns)
+        self.pseudo_inverse = np.linalg.pinv(self.design)
+
+    # least-squares coefficients for rankings (or ratings) of the
+    # profiles, one column per respondent (a vector for one respondent)
+    def coefficients(self, rankings):
+        return(np.dot(self.pseudo_inverse, np.asarray(rankings,\
+            dtype = np.float64)))
+
+    # part-worths of every level of each attribute, the last level
+    # being minus the sum of the others... a list with one
+    # (levels x respondents) array per attribute
+    def part_worths(self, rankings):
+        coefficients = self.coefficients(rankings)
+        return([np.concatenate([coefficients[columns],\
+            -coefficients[columns].sum(axis = 0, keepdims = True)])\
+            for columns in self.slices])
+
+    # attribute importance: the range of the part-worths of each
+    # attribute as a percentage of the sum of ranges for all attributes
+    # returns an (attributes x respondents) array
+    def importances(self, rankings, part_worths = None):
+        if part_worths is None:
+            part_worths = self.part_worths(rankings)
+        ranges = np.array([values.max(axis = 0) - values.min(axis = 0)\
+            for values in part_worths])
+        return(100 * ranges / ranges.sum(axis = 0))
@@ -4,10 +4,15 @@
 from __future__ import division, print_function
 
 # load package into the workspace for this program
+import os
 import networkx as nx
 import matplotlib.pyplot as plt  # 2D plotting
 import numpy as np
 
+# import user-defined modules
+import csr_graph
+import network_layout
+
 # generate small-world network with n nodes
 # k is number of nearby nodes to which each node is connected
 # and p probability of rewiring from nearby node to random node
@@ -19,30 +24,72 @@ small_world_mat = nx.adjacency_matrix(small_world)
 # print(small_world_mat)  # undirected networks are symmetric
 
 # examine alternative layouts for plotting the small_world 
-# plot the network/graph with default layout 
+# each layout is computed once and cached by graph structure
+small_world_layouts = network_layout.get_layouts(small_world,\
+    methods = ['force', 'spring', 'circular', 'shell'])
+
+# plot the network/graph with default (force-directed) layout 
 fig = plt.figure()
-nx.draw_networkx(small_world, node_size = 200, node_color = 'yellow')
+nx.draw_networkx(small_world, node_size = 200, node_color = 'yellow',\
+    pos = small_world_layouts['force'])
 plt.show()
 
 # spring layout
 fig = plt.figure()
 nx.draw_networkx(small_world, node_size = 200, node_color = 'yellow',\
-    pos = nx.spring_layout(small_world))
+    pos = small_world_layouts['spring'])
 plt.show()
 
 # circlular layout
 fig = plt.figure()
 nx.draw_networkx(small_world, node_size = 200, node_color = 'yellow',\
-    pos = nx.circular_layout(small_world))
+    pos = small_world_layouts['circular'])
 plt.show()
 
 # shell/concentric circles layout
 fig = plt.figure()
 nx.draw_networkx(small_world, node_size = 200, node_color = 'yellow',\
-    pos = nx.shell_layout(small_world))
+    pos = small_world_layouts['shell'])
 plt.show()
 
 # Gephi provides interactive network plots 
 # dump the graph object in GraphML format for input to Gephi
 # and for initial network structure in pynetsim
 nx.write_graphml(small_world,'small_world_network.graphml')
+
+# large networks are loaded from edge lists into compressed sparse row
+# arrays, cached as memory-mapped files after the first load...
+# the Wikipedia voting network has about 7 thousand nodes and
+# 100 thousand directed edges
+wiki = csr_graph.load_graph(os.path.join('..', 'MDS_Appendix_C',\
+    'MDS_Appendix_C_16', 'wiki_edges.txt'), directed = True)
+print(wiki.n_nodes(), wiki.n_edges())
+
+# degree distribution (in plus out degree)
+wiki_degrees, wiki_degree_counts = csr_graph.degree_distribution(wiki)
+fig = plt.figure()
+plt.loglog(wiki_degrees, wiki_degree_counts, marker = 'o', linestyle = '')
+plt.xlabel('Degree')
+plt.ylabel('Number of Nodes')
+plt.show()
+
+# PageRank: node ids of the ten highest-ranked nodes
+wiki_pagerank = csr_graph.pagerank(wiki)
+print(wiki.node_ids[np.argsort(wiki_pagerank)[::-1][:10]])
+
+# weakly and strongly connected components
+print(csr_graph.connected_components(wiki, connection = 'weak')[0])
+print(csr_graph.connected_components(wiki, connection = 'strong')[0])
+
+# average clustering coefficient of the undirected network
+print(csr_graph.clustering_coefficient(wiki).mean())
+
+# force-directed layout of the wiki network with grid-approximated
+# repulsion, saved for later sessions in the layout cache directory
+wiki_positions = network_layout.get_layout(wiki, method = 'force',\
+    cache_directory = 'layout_cache')
+fig = plt.figure()
+plt.scatter(wiki_positions[:, 0], wiki_positions[:, 1], s = 1,\
+    c = np.log1p(wiki.out_degree() + wiki.in_degree()))
+plt.axis('off')
+plt.show()
@@ -5,10 +5,16 @@ from __future__ import division, print_function
 from future_builtins import ascii, filter, hex, map, oct, zip
 
 # import packages into the namespace for this program
+import os
+import functools
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 
+# import user-defined modules
+import virus_simulator
+import virus_trials
+
 # -----------------------------
 # Simulation study background
 # -----------------------------
@@ -17,7 +23,7 @@ import statsmodels.api as sm
 
 # added one line of code to the Virus on a Network program:
 
-if ticks = 200 [stop]
+#   if ticks = 200 [stop]
 
 # this line was added to stop the simulation at exactly 200 ticks
 # the line was added to the <to go> code block as shown here:
@@ -63,31 +69,59 @@ if ticks = 200 [stop]
 # Analysis of Deviance
 # -----------------------------
 
-# read in summary results and code the experimental factors
-virus = pd.read_csv("virus_results.csv")
+# parse the trial world exports directly (in parallel), rather than
+# computing proportions in Excel... infected counts are taken from the
+# TURTLES section and the design factors from the GLOBALS section
+virus = virus_trials.parse_trials(\
+    os.path.join('NetLogo_results', 'trial*.csv'))
 
 # check input DataFrame
-print(virus)
-
-Intercept = np.array([1] * len(virus))
-
-# use dictionary object for mapping to 0/1 binary codes
-degree_to_binary = {3 : 0, 5 : 1}
-Connectivity = np.array(virus['degree'].map(degree_to_binary))
-
-# use dictionary object for mapping to 0/1 binary codes
-spread_to_binary = {5 : 0, 10 : 1}
-Susceptibility = np.array(virus['spread'].map(spread_to_binary))
+print(virus[['trial', 'degree', 'spread', 'infected']])
 
-Connectivity_Susceptibility = Connectivity * Susceptibility
-
-Design_Matrix = np.array([Intercept, Connectivity, Susceptibility, Connectivity_Susceptibility]).T
+# proportion of nodes infected in each trial, with 0/1 codes for the
+# experimental factors... trials remain the observations, as with the
+# proportions of virus_results.csv
+Infected_Share, Nodes, Design_Matrix, design_cells =\
+    virus_trials.trial_infections(virus)
+Design_Matrix.columns = ['Intercept', 'Connectivity', 'Susceptibility',\
+    'Connectivity_Susceptibility']
 
+print(design_cells)
 print(Design_Matrix)
-
-Market_Share = np.array(virus['infected'])
+print(Infected_Share)
 
 # generalized linear model for a response variable that is a proportion
-glm_binom = sm.GLM(Market_Share, Design_Matrix, family=sm.families.Binomial())
-res = glm_binom.fit()
-print(res.summary())
\ No newline at end of file
+# weighted by the nodes of each trial... nodes of one network do not
+# become infected independently, so trials of the same cell vary more
+# than binomial counts would, and the scale is estimated from the
+# Pearson chi-square of the trials (quasi-binomial)
+glm_binom = sm.GLM(Infected_Share, Design_Matrix,\
+    family=sm.families.Binomial(), var_weights = Nodes)
+res = glm_binom.fit(scale = 'X2')
+print(res.summary())
+
+# -----------------------------
+# Native Simulation Sweep
+# -----------------------------
+# the same 2 x 2 experiment run with the vectorized simulator, with
+# many more replications per cell... each replicate gets a new network
+# made as in the NetLogo model, which builds one at every setup (a fixed
+# network saved by MDS_Exhibit_11_3.py may be used instead, as with
+# virus_simulator.read_network('small_world_network.graphml'))
+networks = dict((degree, functools.partial(virus_simulator.spatial_network,\
+    n_nodes = 150, degree = degree)) for degree in [3, 5])
+simulated = virus_simulator.simulate_design(networks, spreads = [5, 10],\
+    n_replicates = 500)
+
+# results in the format of virus_results.csv plus node counts
+simulated.to_csv('virus_simulated_results.csv', index = False)
+print(simulated.groupby(['degree', 'spread'])['infected'].mean())
+
+Simulated_Share, Simulated_Nodes, Simulated_Design, simulated_cells =\
+    virus_trials.trial_infections(simulated)
+Simulated_Design.columns = Design_Matrix.columns
+
+glm_binom_simulated = sm.GLM(Simulated_Share, Simulated_Design,\
+    family=sm.families.Binomial(), var_weights = Simulated_Nodes)
+res_simulated = glm_binom_simulated.fit(scale = 'X2')
+print(res_simulated.summary())
@@ -0,0 +1,181 @@
+# Compressed Sparse Row Graphs for Large Edge Lists (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # file paths for the cache
+import json  # graph metadata stored with the cache
+import hashlib  # cache key from file contents
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # vectorized edge list parsing
+from scipy import sparse  # sparse adjacency matrices
+from scipy.sparse import csgraph  # connected components
+
+DEFAULT_CACHE_DIRECTORY = 'graph_cache'
+
+# number of rows of the adjacency matrix used at a time
+# when counting triangles
+DEFAULT_BLOCK_SIZE = 4096
+
+# graph stored as CSR arrays: the targets of edges from node i are
+# indices[indptr[i]:indptr[i + 1]], and node_ids maps the consecutive
+# node numbers 0, 1, ..., n - 1 back to the ids in the edge list
+class CSRGraph(object):
+
+    def __init__(self, indptr, indices, node_ids, directed = True):
+        self.indptr = indptr
+        self.indices = indices
+        self.node_ids = node_ids
+        self.directed = directed
+
+    def n_nodes(self):
+        return(len(self.indptr) - 1)
+
+    def n_edges(self):
+        return(len(self.indices))
+
+    def out_degree(self):
+        return(np.diff(self.indptr))
+
+    def in_degree(self):
+        return(np.bincount(self.indices, minlength = self.n_nodes()))
+
+    # scipy sparse adjacency matrix sharing the index arrays
+    def adjacency(self, dtype = np.float64):
+        return(sparse.csr_matrix((np.ones(self.n_edges(), dtype = dtype),\
+            self.indices, self.indptr),\
+            shape = (self.n_nodes(), self.n_nodes()), copy = False))
+
+    # symmetric 0/1 adjacency without self loops (the undirected graph)
+    def undirected(self, dtype = np.float64):
+        adjacency = self.adjacency(dtype)
+        symmetric = ((adjacency + adjacency.T) > 0).astype(dtype).tocsr()
+        symmetric.setdiag(0)
+        symmetric.eliminate_zeros()
+        return(symmetric)
+
+# CSR arrays from arrays of edge sources and targets
+# node ids are relabeled 0, 1, ..., n - 1 in sorted id order and
+# duplicate edges are removed
+def from_edges(sources, targets, directed = True):
+    node_ids, codes = np.unique(np.concatenate([sources, targets]),\
+        return_inverse = True)
+    n_nodes = len(node_ids)
+    codes = codes.astype(np.int64)
+    sources = codes[:len(sources)]
+    targets = codes[len(sources):]
+    if not directed:
+        sources, targets = np.concatenate([sources, targets]),\
+            np.concatenate([targets, sources])
+    edges = np.unique(sources * n_nodes + targets)
+    sources = edges // n_nodes
+    indices = (edges % n_nodes).astype(np.int32)
+    indptr = np.concatenate([[0],\
+        np.cumsum(np.bincount(sources, minlength = n_nodes))])
+    return(CSRGraph(indptr.astype(np.int64), indices, node_ids, directed))
+
+# parse a delimited edge list with the C parser of pandas, skipping
+# comment lines (#) and a header line of column names if there is one
+def read_edges(file_name, sep = '\t'):
+    with open(file_name) as source:
+        first = source.readline()
+        while first.startswith('#'):
+            first = source.readline()
+    header = 0 if not first.split(sep)[0].strip().lstrip('-').isdigit()\
+        else None
+    edges = pd.read_csv(file_name, sep = sep, comment = '#',\
+        header = header, usecols = [0, 1], dtype = np.int64)
+    return(edges.iloc[:, 0].values, edges.iloc[:, 1].values)
+
+# hash of file contents read in blocks
+def file_hash(file_name, block_size = 1 << 20):
+    digest = hashlib.sha1()
+    with open(file_name, 'rb') as source:
+        block = source.read(block_size)
+        while block:
+            digest.update(block)
+            block = source.read(block_size)
+    return(digest.hexdigest())
+
+# load a graph from an edge list file, building and caching its CSR
+# arrays on first use... arrays are returned as read-only memory-mapped
+# .npy files, so later loads read only the pages that are used
+def load_graph(file_name, directed = True, sep = '\t',\
+    cache_directory = None):
+    if cache_directory is None:
+        cache_directory = os.path.join(os.path.dirname(file_name),\
+            DEFAULT_CACHE_DIRECTORY)
+    directory = os.path.join(cache_directory, file_hash(file_name) +\
+        ('_directed' if directed else '_undirected'))
+    metadata_file = os.path.join(directory, 'graph.json')
+    if not os.path.exists(metadata_file):
+        graph = from_edges(*read_edges(file_name, sep),\
+            directed = directed)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        for name in ['indptr', 'indices', 'node_ids']:
+            np.save(os.path.join(directory, name + '.npy'),\
+                getattr(graph, name))
+        # metadata file written last marks the cache entry as complete
+        with open(metadata_file, 'w') as metadata_output:
+            json.dump({'source': os.path.basename(file_name),\
+                'directed': directed}, metadata_output)
+    arrays = dict((name, np.load(os.path.join(directory, name + '.npy'),\
+        mmap_mode = 'r')) for name in ['indptr', 'indices', 'node_ids'])
+    return(CSRGraph(arrays['indptr'], arrays['indices'],\
+        arrays['node_ids'], directed))
+
+# number of nodes with each degree
+# mode is 'out', 'in', or 'total' (in plus out for directed graphs)
+# returns the degrees present and their counts
+def degree_distribution(graph, mode = 'total'):
+    if mode == 'out' or not graph.directed:
+        degree = graph.out_degree()
+    elif mode == 'in':
+        degree = graph.in_degree()
+    else:
+        degree = graph.out_degree() + graph.in_degree()
+    counts = np.bincount(degree)
+    degrees = np.flatnonzero(counts)
+    return(degrees, counts[degrees])
+
+# PageRank by power iteration with sparse matrix-vector products
+# nodes without out-links spread their rank evenly over all nodes,
+# and iteration stops when the L1 change is below n_nodes * tolerance
+# (the stopping rule of networkx.pagerank)
+def pagerank(graph, damping = 0.85, tolerance = 1.0e-6, max_iter = 100):
+    n = graph.n_nodes()
+    out_degree = graph.out_degree().astype(np.float64)
+    dangling = (out_degree == 0)
+    inverse_degree = np.where(dangling, 0.0, 1.0 / np.maximum(out_degree, 1))
+    transposed = graph.adjacency().T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for iteration in range(max_iter):
+        previous = rank
+        rank = damping * (transposed.dot(previous * inverse_degree) +\
+            previous[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(rank - previous).sum() < n * tolerance:
+            break
+    return(rank)
+
+# connected components ('weak' or 'strong' for directed graphs)
+# returns the number of components and the component of each node
+def connected_components(graph, connection = 'weak'):
+    return(csgraph.connected_components(graph.adjacency(),\
+        directed = graph.directed, connection = connection))
+
+# local clustering coefficient of each node in the undirected graph:
+# triangles through the node over pairs of its neighbors... triangles
+# are the row sums of (S S) * S, computed a block of rows at a time
+def clustering_coefficient(graph, block_size = DEFAULT_BLOCK_SIZE):
+    symmetric = graph.undirected()
+    n = symmetric.shape[0]
+    triangles = np.empty(n)
+    for begin in range(0, n, block_size):
+        block = symmetric[begin:begin + block_size]
+        triangles[begin:begin + block_size] = np.asarray(\
+            block.dot(symmetric).multiply(block).sum(axis = 1)).ravel() / 2
+    degree = np.diff(symmetric.indptr)
+    pairs = degree * (degree - 1) / 2
+    return(np.where(pairs > 0, triangles / np.maximum(pairs, 1), 0.0))
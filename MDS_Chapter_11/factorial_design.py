@@ -0,0 +1,92 @@
+# Design Matrices for Factorial Experiments (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import itertools  # factor combinations for interaction terms
+
+import numpy as np  # arrays and numerical processing
+from scipy import sparse  # sparse design matrices
+
+# import user-defined module
+import recode
+
+# factors are given as a list of (column name, levels) pairs with the
+# first level the reference level, for example
+#   [('muser', ['NO', 'YES']), ('wtemp', ['LOW', 'HIGH']),
+#    ('wtype', ['SOFT', 'MEDIUM', 'HARD'])]
+
+# level codes (0 for the reference level) of each factor in one pass
+# returns an observations x factors uint8 matrix, with recode.MISSING
+# for missing data or values that are not levels of the factor
+def factor_codes(data_frame, factors):
+    return(recode.recode_columns(data_frame, [(name,\
+        dict((level, code) for code, level in enumerate(levels)))\
+        for name, levels in factors]))
+
+# terms of the design as (name, [(factor index, level code), ...])
+# an intercept, main effects, and all interactions of up to order factors
+# (order None for all), with treatment (dummy) coding... names join
+# level and factor, as in YESmuser_HIGHwtemp
+def design_terms(factors, order = None):
+    if order is None:
+        order = len(factors)
+    terms = [('Intercept', [])]
+    for n_factors in range(1, order + 1):
+        for combination in itertools.combinations(range(len(factors)),\
+            n_factors):
+            for level_codes in itertools.product(*[range(1,\
+                len(factors[index][1])) for index in combination]):
+                parts = list(zip(combination, level_codes))
+                terms.append(('_'.join(str(factors[index][1][code]) +\
+                    factors[index][0] for index, code in parts), parts))
+    return(terms)
+
+# design matrix from factor level codes, written column by column into
+# one preallocated column-major array (or a sparse CSC matrix when
+# sparse is True)... returns the matrix and the term names
+def design_matrix(codes, factors, order = None, sparse_matrix = False):
+    terms = design_terms(factors, order)
+    names = [name for name, parts in terms]
+    if sparse_matrix:
+        rows = []
+        for name, parts in terms:
+            selected = np.ones(codes.shape[0], dtype = bool)
+            for index, code in parts:
+                selected &= (codes[:, index] == code)
+            rows.append(np.flatnonzero(selected))
+        indptr = np.concatenate([[0], np.cumsum([len(r) for r in rows])])
+        indices = np.concatenate(rows) if rows else\
+            np.zeros(0, dtype = np.intp)
+        return(sparse.csc_matrix((np.ones(len(indices)), indices, indptr),\
+            shape = (codes.shape[0], len(terms))), names)
+    matrix = np.ones((codes.shape[0], len(terms)), order = 'F')
+    for column, (name, parts) in enumerate(terms):
+        for index, code in parts:
+            matrix[:, column] *= (codes[:, index] == code)
+    return(matrix, names)
+
+# collapse a factorial experiment with a 0/1 response into one binomial
+# row per observed cell (covariate pattern)... the response is returned
+# as [successes, failures] columns, as sm.GLM with a Binomial family
+# expects for grouped data, so the fit depends on the number of cells
+# rather than the number of observations
+# returns (response counts, design matrix, term names, cell level codes)
+def grouped_binomial(data_frame, factors, response, order = None,\
+    sparse_matrix = False):
+    codes = factor_codes(data_frame, factors)
+    response = np.ravel(np.asarray(response, dtype = np.float64))
+    complete = recode.complete_rows(codes)
+    if not complete.all():
+        codes = codes[complete]
+        response = response[complete]
+    shape = [len(levels) for name, levels in factors]
+    cells = np.ravel_multi_index(tuple(codes.T), shape)
+    observed, inverse = np.unique(cells, return_inverse = True)
+    successes = np.bincount(inverse, weights = response,\
+        minlength = len(observed))
+    totals = np.bincount(inverse, minlength = len(observed))
+    cell_codes = np.column_stack(np.unravel_index(observed, shape))
+    design, names = design_matrix(cell_codes, factors, order, sparse_matrix)
+    return(np.column_stack([successes, totals - successes]), design,\
+        names, cell_codes)
@@ -0,0 +1,186 @@
+# Cached and Scalable Layouts for Network Plots (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # file paths for the cache
+import json  # layout options in cache keys
+import hashlib  # cache key from the graph structure
+
+import numpy as np  # arrays and numerical processing
+import networkx as nx  # layouts from networkx
+from scipy import sparse  # sparse adjacency matrices
+from scipy import fft  # FFT convolution for repulsive forces
+
+# layouts computed in this session keyed by graph hash, method, options
+_cached_layouts = {}
+
+# symmetric CSR adjacency (no self loops) of a networkx graph, a CSR
+# graph from csr_graph (anything with an undirected method), or a sparse
+# matrix, with nodes in the order of graph.nodes() for networkx graphs
+def layout_adjacency(graph):
+    if isinstance(graph, nx.Graph):
+        adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(graph,\
+            nodelist = list(graph.nodes()), dtype = np.float64))
+    elif hasattr(graph, 'undirected'):
+        return(graph.undirected())
+    else:
+        adjacency = sparse.csr_matrix(graph, dtype = np.float64)
+    symmetric = ((adjacency + adjacency.T) > 0).astype(np.float64).tocsr()
+    symmetric.setdiag(0)
+    symmetric.eliminate_zeros()
+    symmetric.sort_indices()
+    return(symmetric)
+
+# hash of the graph structure (number of nodes and sorted CSR arrays)
+def graph_hash(adjacency):
+    digest = hashlib.sha1(str(adjacency.shape[0]).encode('ascii'))
+    digest.update(np.ascontiguousarray(adjacency.indptr,\
+        dtype = np.int64).tobytes())
+    digest.update(np.ascontiguousarray(adjacency.indices,\
+        dtype = np.int64).tobytes())
+    return(digest.hexdigest())
+
+# node positions on a circle
+def circular_positions(n_nodes):
+    angles = 2 * np.pi * np.arange(n_nodes) / max(n_nodes, 1)
+    return(np.column_stack([np.cos(angles), np.sin(angles)]))
+
+# positions rescaled to [-scale, scale] around the origin
+def rescale(positions, scale = 1.0):
+    positions = positions - positions.mean(axis = 0)
+    limit = np.abs(positions).max()
+    if limit > 0:
+        positions = positions * (scale / limit)
+    return(positions)
+
+# Fourier transforms of the repulsion kernels for a grid of unit cells:
+# the force at offset (dx, dy) cells from a unit mass is 1 / d along the
+# offset, with no force at offset zero... offsets are wrapped around a
+# periodic grid of fft_size >= 2 * grid_size - 1 cells, so a circular
+# convolution with a zero-padded density grid has no wrap-around error
+def _repulsion_kernels(grid_size, fft_size):
+    offsets = np.arange(fft_size)
+    offsets[offsets >= grid_size] -= fft_size
+    dx, dy = np.meshgrid(offsets, offsets, indexing = 'ij')
+    distance2 = (dx ** 2 + dy ** 2).astype(np.float64)
+    distance2[0, 0] = np.inf
+    return(fft.rfft2(dx / distance2), fft.rfft2(dy / distance2))
+
+# force-directed (Fruchterman-Reingold) layout with repulsion computed on
+# a grid, a particle-mesh alternative to a Barnes-Hut tree: node masses
+# are binned into a grid_size x grid_size grid, the repulsive field of
+# all nodes is an FFT convolution of the grid with the repulsion kernel
+# (transformed once), and each node reads the field at its cell... so
+# each iteration costs about n + grid_size**2 log(grid_size) rather
+# than n**2
+# attraction along edges is computed edge by edge with bincount sums
+def force_layout(adjacency, iterations = 50, grid_size = None,\
+    random_state = 9999):
+    n = adjacency.shape[0]
+    rng = np.random.RandomState(random_state)
+    positions = rng.uniform(-1, 1, size = (n, 2))
+    if n < 2:
+        return(positions)
+    if grid_size is None:
+        grid_size = int(np.clip(2 * np.sqrt(n), 32, 512))
+    coo = adjacency.tocoo()
+    rows, columns = coo.row, coo.col
+    k = np.sqrt(4.0 / n)  # ideal distance in a [-1, 1] square
+    fft_size = fft.next_fast_len(2 * grid_size - 1)
+    kernel_x, kernel_y = _repulsion_kernels(grid_size, fft_size)
+    temperature = 0.2
+    cooling = temperature / (iterations + 1)
+    for iteration in range(iterations):
+        # node masses on a grid covering the current positions
+        low = positions.min(axis = 0)
+        width = max((positions.max(axis = 0) - low).max(), 1.0e-9) *\
+            (1 + 1.0e-9)
+        h = width / grid_size
+        cell_xy = np.minimum(((positions - low) / h).astype(np.int64),\
+            grid_size - 1)
+        cells = cell_xy[:, 0] * grid_size + cell_xy[:, 1]
+        density = np.bincount(cells, minlength = grid_size * grid_size).\
+            reshape(grid_size, grid_size).astype(np.float64)
+        # repulsive field at every cell from all nodes, k**2 / d
+        # along each offset with distances in cells of width h
+        density = fft.rfft2(density, (fft_size, fft_size))
+        shape = (fft_size, fft_size)
+        field_x = fft.irfft2(density * kernel_x, shape)
+        field_y = fft.irfft2(density * kernel_y, shape)
+        displacement = (k * k / h) * np.column_stack([\
+            field_x[cell_xy[:, 0], cell_xy[:, 1]],\
+            field_y[cell_xy[:, 0], cell_xy[:, 1]]])
+        # attraction along edges
+        delta = positions[rows] - positions[columns]
+        distance = np.sqrt((delta ** 2).sum(axis = 1))
+        pull = delta * (distance / k)[:, np.newaxis]
+        displacement[:, 0] -= np.bincount(rows, weights = pull[:, 0],\
+            minlength = n)
+        displacement[:, 1] -= np.bincount(rows, weights = pull[:, 1],\
+            minlength = n)
+        # move each node at most the current temperature
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis = 1)),\
+            1.0e-9)
+        positions = positions + displacement *\
+            (np.minimum(length, temperature) / length)[:, np.newaxis]
+        temperature = temperature - cooling
+    return(positions)
+
+# positions from one layout method
+#   'force': force-directed layout with grid-approximated repulsion
+#   'spring': networkx spring_layout (exact, for small graphs)
+#   'circular': nodes evenly spaced on a circle
+#   'shell': networkx shell_layout
+def compute_layout(adjacency, method = 'force', **options):
+    n = adjacency.shape[0]
+    if method == 'force':
+        positions = force_layout(adjacency, **options)
+    elif method == 'circular':
+        return(circular_positions(n))
+    elif method in ('spring', 'shell'):
+        graph = nx.from_scipy_sparse_array(adjacency)
+        layout_function = nx.spring_layout if method == 'spring'\
+            else nx.shell_layout
+        layout = layout_function(graph, **options)
+        positions = np.array([layout[node] for node in range(n)])
+    else:
+        print('\ncompute_layout error: method must be force, spring,',\
+            'circular, or shell\n')
+        return(None)
+    return(rescale(positions))
+
+# layout positions computed once per graph, method, and options...
+# positions are kept for the session and, with a cache_directory,
+# saved as .npy files so later sessions load them instead
+# returns a dictionary of positions by node for networkx graphs
+# (the pos argument of nx.draw_networkx), otherwise an n x 2 array
+def get_layout(graph, method = 'force', cache_directory = None, **options):
+    adjacency = layout_adjacency(graph)
+    key = hashlib.sha1((graph_hash(adjacency) + method +\
+        json.dumps(options, sort_keys = True)).encode('utf-8')).hexdigest()
+    if key not in _cached_layouts:
+        cache_file = None if cache_directory is None else\
+            os.path.join(cache_directory, key + '.npy')
+        if cache_file is not None and os.path.exists(cache_file):
+            _cached_layouts[key] = np.load(cache_file)
+        else:
+            positions = compute_layout(adjacency, method, **options)
+            if positions is None:
+                return(None)
+            _cached_layouts[key] = positions
+            if cache_file is not None:
+                if not os.path.exists(cache_directory):
+                    os.makedirs(cache_directory)
+                np.save(cache_file, positions)
+    positions = _cached_layouts[key]
+    if isinstance(graph, nx.Graph):
+        return(dict(zip(graph.nodes(), positions)))
+    return(positions)
+
+# several layouts of one graph, each computed (or loaded) once
+# returns a dictionary of layouts keyed by method
+def get_layouts(graph, methods = ('force', 'circular', 'shell'),\
+    cache_directory = None):
+    return(dict((method, get_layout(graph, method, cache_directory))\
+        for method in methods))
@@ -0,0 +1,168 @@
+# Simulating Virus Spread on a Network (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import itertools  # cells of the experimental design
+import multiprocessing  # process pool for design cells
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for trial results
+import networkx as nx  # GraphML input
+from scipy import sparse  # CSR adjacency matrices
+
+# import user-defined module
+import process_pool
+
+# settings of the Virus on a Network model, as in the NetLogo globals
+# chances are percentages, as in the NetLogo interface
+DEFAULT_SETTINGS = {'ticks': 200,
+    'initial_outbreak_size': 3,
+    'virus_check_frequency': 1,
+    'recovery_chance': 5,
+    'gain_resistance_chance': 5}
+
+# CSR adjacency matrix of an undirected network from a GraphML file,
+# as written by nx.write_graphml in MDS_Exhibit_11_3.py
+def read_network(file_name):
+    return(network_adjacency(nx.read_graphml(file_name)))
+
+def network_adjacency(graph):
+    adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(graph,\
+        dtype = np.float32))
+    return(((adjacency + adjacency.T) > 0).astype(np.float32).tocsr())
+
+# spatially clustered network as made by the NetLogo model: nodes are
+# placed at random and a random node is linked to its nearest node not
+# already linked to it, until there are n_nodes * degree / 2 links
+def spatial_network(n_nodes = 150, degree = 3, random_state = 9999):
+    rng = np.random.RandomState(random_state)
+    positions = rng.uniform(-20, 20, size = (n_nodes, 2))
+    linked = [set([node]) for node in range(n_nodes)]
+    rows = []
+    columns = []
+    n_links = int(round(n_nodes * degree / 2))
+    while len(rows) < n_links:
+        node = rng.randint(n_nodes)
+        if len(linked[node]) == n_nodes:
+            continue
+        distances = np.sqrt(((positions - positions[node]) ** 2).sum(axis = 1))
+        distances[list(linked[node])] = np.inf
+        choice = int(np.argmin(distances))
+        linked[node].add(choice)
+        linked[choice].add(node)
+        rows.append(node)
+        columns.append(choice)
+    adjacency = sparse.coo_matrix((np.ones(len(rows), dtype = np.float32),\
+        (rows, columns)), shape = (n_nodes, n_nodes))
+    return((adjacency + adjacency.T).tocsr())
+
+# run n_replicates of the simulation at once on one network, or on a
+# network per replicate when adjacency is a list of n_replicates
+# matrices with the same number of nodes (stacked block-diagonally)
+# node states are n_nodes x n_replicates boolean matrices, so each tick
+# is one sparse matrix product (infected neighbors of every node in every
+# replicate) and elementwise updates:
+#   spread: a susceptible node with m infected neighbors is infected
+#     with probability 1 - (1 - spread/100)**m
+#   virus checks: an infected node due for a check recovers with the
+#     recovery chance, and then gains resistance with the gain chance
+#     (otherwise it is susceptible again)
+# the run stops after settings['ticks'] ticks or once no nodes are
+# infected in any replicate
+# returns infected and resistant counts for each replicate
+def simulate(adjacency, spread, n_replicates = 100, settings = None,\
+    random_state = 9999):
+    settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+    rng = np.random.RandomState(random_state)
+    if isinstance(adjacency, list):
+        if len(adjacency) != n_replicates or\
+            len(set(matrix.shape for matrix in adjacency)) != 1:
+            print('\nsimulate error: one network per replicate, all with',\
+                'the same number of nodes\n')
+            return(None)
+        n_nodes = adjacency[0].shape[0]
+        adjacency = sparse.block_diag(adjacency, format = 'csr',\
+            dtype = np.float32)
+    else:
+        adjacency = sparse.csr_matrix(adjacency, dtype = np.float32)
+        n_nodes = adjacency.shape[0]
+    stacked = (adjacency.shape[0] != n_nodes)
+    shape = (n_nodes, n_replicates)
+    # initial outbreak at randomly chosen nodes in each replicate
+    outbreak = np.argsort(rng.random_sample(shape),\
+        axis = 0)[:settings['initial_outbreak_size']]
+    infected = np.zeros(shape, dtype = bool)
+    infected[outbreak, np.arange(n_replicates)] = True
+    resistant = np.zeros(shape, dtype = bool)
+    frequency = settings['virus_check_frequency']
+    timer = rng.randint(frequency, size = shape)
+    not_spread = 1 - spread / 100
+    for tick in range(settings['ticks']):
+        if not infected.any():
+            break
+        timer = timer + 1
+        timer[timer >= frequency] = 0
+        if stacked:
+            infected_neighbors = adjacency.dot(infected.astype(np.float32)\
+                .ravel(order = 'F')).reshape(shape, order = 'F')
+        else:
+            infected_neighbors = adjacency.dot(infected.astype(np.float32))
+        susceptible = ~(infected | resistant)
+        infected |= susceptible & (rng.random_sample(shape) <\
+            1 - not_spread ** infected_neighbors)
+        checked = infected & (timer == 0)
+        recovered = checked & (rng.random_sample(shape) <\
+            settings['recovery_chance'] / 100)
+        infected &= ~recovered
+        resistant |= recovered & (rng.random_sample(shape) <\
+            settings['gain_resistance_chance'] / 100)
+    return(infected.sum(axis = 0), resistant.sum(axis = 0))
+
+# one cell of the design... a network factory is called with a seed
+# for each replicate, so the networks vary as NetLogo's do when each
+# trial is set up anew
+def _simulate_cell(task):
+    cell, degree, spread, network, n_replicates, settings,\
+        random_state = task
+    if callable(network):
+        network = [network(random_state = random_state * n_replicates +\
+            replicate) for replicate in range(n_replicates)]
+    n_nodes = network[0].shape[0] if isinstance(network, list) else\
+        network.shape[0]
+    infected, resistant = simulate(network, spread, n_replicates,\
+        settings, random_state)
+    return(pd.DataFrame({'degree': degree, 'spread': spread,\
+        'infected': infected / n_nodes,\
+        'infected_count': infected, 'resistant_count': resistant,\
+        'turtles': n_nodes, 'cell': cell}))
+
+# full factorial sweep of network (keyed by degree) x spread chance
+# with n_replicates trials per cell and cells run in a process pool
+# networks maps each degree level to an adjacency matrix used by every
+# replicate, as from read_network, or to a network factory called with
+# random_state for a new network in each replicate, for example
+#   functools.partial(spatial_network, n_nodes = 150, degree = 3)
+# returns one row per trial with the columns of virus_results.csv
+# (trial, degree, spread, infected) and the infected, resistant, and
+# node counts used by virus_trials.trial_infections
+def simulate_design(networks, spreads = (5, 10), n_replicates = 100,\
+    settings = None, n_jobs = None, random_state = 9999):
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs()
+    tasks = [(cell, degree, spread, networks[degree], n_replicates,\
+        settings, random_state + cell) for cell, (degree, spread) in\
+        enumerate(itertools.product(sorted(networks), spreads))]
+    n_jobs = max(1, min(n_jobs, len(tasks)))
+    if n_jobs == 1:
+        results = [_simulate_cell(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(processes = n_jobs)
+        try:
+            results = pool.map(_simulate_cell, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    trials = pd.concat(results, ignore_index = True)
+    trials.insert(0, 'trial', np.arange(1, len(trials) + 1))
+    return(trials.drop('cell', axis = 1))
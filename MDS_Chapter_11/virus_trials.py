@@ -0,0 +1,113 @@
+# Parsing NetLogo World Exports from Virus Simulation Trials (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # file names and trial numbers
+import re  # trial number from the file name
+import csv  # comma-delimited world export sections
+import glob  # trial export files
+import multiprocessing  # process pool for parsing trial files
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for trial results
+
+# import user-defined modules
+import factorial_design
+import process_pool
+import recode
+
+# globals of the Virus on a Network model kept for each trial
+TRIAL_GLOBALS = {'ticks': 'ticks',
+    'degree': 'average-node-degree',
+    'spread': 'virus-spread-chance',
+    'nodes': 'number-of-nodes'}
+
+# experimental factors of the virus experiment, reference levels first
+VIRUS_FACTORS = [('degree', [3, 5]), ('spread', [5, 10])]
+
+# one trial from a NetLogo export-world file... sections of the file
+# start with a line holding only the section name (GLOBALS, TURTLES, ...),
+# followed by a header line and data lines. only the GLOBALS and TURTLES
+# sections are read, and reading stops at the section after TURTLES, so
+# the patches, links, and plots are never parsed
+# returns a dictionary of trial settings and infected/resistant counts
+def parse_trial(file_name):
+    trial = {'file': os.path.basename(file_name)}
+    digits = re.findall(r'\d+', trial['file'])
+    trial['trial'] = int(digits[-1]) if digits else np.nan
+    section = None
+    header = None
+    infected = resistant = turtles = 0
+    with open(file_name, newline = '') as source:
+        for row in csv.reader(source):
+            if not row or not any(row):
+                continue
+            if not any(row[1:]) and row[0].isupper():
+                if section == 'TURTLES':
+                    break
+                section = row[0]
+                header = None
+                continue
+            if section not in ('GLOBALS', 'TURTLES'):
+                continue
+            if header is None:
+                header = dict((name, index)\
+                    for index, name in enumerate(row))
+                continue
+            if section == 'GLOBALS':
+                for name, source_name in TRIAL_GLOBALS.items():
+                    trial[name] = float(row[header[source_name]])
+            else:
+                turtles = turtles + 1
+                infected = infected +\
+                    (row[header['infected?']].upper() == 'TRUE')
+                resistant = resistant +\
+                    (row[header['resistant?']].upper() == 'TRUE')
+    trial['turtles'] = turtles
+    trial['infected_count'] = infected
+    trial['resistant_count'] = resistant
+    trial['infected'] = infected / turtles if turtles > 0 else np.nan
+    return(trial)
+
+# parse many trial files concurrently in a process pool
+# (file_names may also be a glob pattern)... one row per trial
+def parse_trials(file_names = os.path.join('NetLogo_results', 'trial*.csv'),\
+    n_jobs = None):
+    if isinstance(file_names, str):
+        file_names = sorted(glob.glob(file_names))
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs(len(file_names))
+    n_jobs = max(1, min(n_jobs, len(file_names)))
+    if n_jobs == 1:
+        trials = [parse_trial(file_name) for file_name in file_names]
+    else:
+        pool = multiprocessing.Pool(processes = n_jobs)
+        try:
+            trials = pool.map(parse_trial, file_names,\
+                chunksize = max(1, len(file_names) // (4 * n_jobs)))
+        finally:
+            pool.close()
+            pool.join()
+    trials = pd.DataFrame(trials)
+    for name in ['degree', 'spread', 'ticks', 'nodes']:
+        trials[name] = trials[name].astype(np.int64)
+    return(trials.sort_values('trial').reset_index(drop = True))
+
+# proportion of nodes infected in each trial, one row per trial, so the
+# variation among trials of the same cell remains in the residuals
+# returns the proportions, the number of nodes of each trial (variance
+# weights for a binomial GLM, whose scale = 'X2' fit then estimates the
+# overdispersion), the design matrix with an intercept, main effects,
+# and interaction as a DataFrame, and the factor levels of each trial
+def trial_infections(trials, factors = VIRUS_FACTORS, order = None):
+    codes = factorial_design.factor_codes(trials, factors)
+    complete = recode.complete_rows(codes)
+    trials = trials[complete]
+    codes = codes[complete]
+    design, names = factorial_design.design_matrix(codes, factors, order)
+    nodes = trials['turtles'].values.astype(np.float64)
+    cells = pd.DataFrame(dict((name, np.asarray(levels)[codes[:, j]])\
+        for j, (name, levels) in enumerate(factors)))
+    return(trials['infected_count'].values / nodes, nodes,\
+        pd.DataFrame(design, columns = names), cells)
@@ -7,7 +7,9 @@ from __future__ import division, print_function
 import pandas as pd  # data frame operations
 import numpy as np  # arrays and math functions
 import statsmodels.api as sm  # statistical models (including regression)
-import statsmodels.formula.api as smf  # statistical models (including regression)
+
+# import user-defined module
+import design_cache
 
 # read data for Studenmund's Restaurants
 # creating data frame restdata
@@ -19,8 +21,12 @@ print(pd.DataFrame.head(restdata))
 # specify regression model
 my_model = str('sales ~ competition + population + income')
 
+# compile the model formula once... its encoding is reused for new sites
+restaurant_design = design_cache.compiled_design(my_model, restdata)
+sales, design = restaurant_design.matrices(index = restdata.index)
+
 # fit the model to the data
-my_model_fit = smf.ols(my_model, data = restdata).fit()
+my_model_fit = sm.OLS(sales, design).fit()
 # summary of model fit to the training set
 print(my_model_fit.summary())
 # predictions from the model fit to the data for current stores
@@ -40,7 +46,8 @@ sites = pd.DataFrame(sites_data)
 
 # obtain predicted sales for the new restaurants
 # rounding to the nearest dollar
-sites['sales_pred'] = my_model_fit.predict(sites)
+sites['sales_pred'] = my_model_fit.predict(\
+    restaurant_design.transform(sites, include_outcome = False)[1])
 print('\nNew sites with predicted sales', sites, '\n')
 
 
@@ -6,6 +6,9 @@ import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 
+# import user-defined module
+import scoring
+
 # read data from comma-delimited text file... create DataFrame object
 sydney = pd.read_csv("sydney.csv")
 
@@ -32,16 +35,10 @@ print(sydney_fit.summary())
 
 sydney['train_prob'] = sydney_fit.predict(linear = False)
 
-# function to convert probability to choice prediction
-def prob_to_response(response_prob, cutoff):
-    if(response_prob > cutoff):
-        return('TRAIN')
-    else:
-        return('CAR')
-            
 # add binary predictions to DataFrame sydney using cutoff value for the case
-sydney['choice_pred'] = \
-    sydney['train_prob'].apply(lambda d: prob_to_response(d, cutoff = 0.50))
+# probabilities above the cutoff map to TRAIN, others to CAR
+sydney['choice_pred'] = scoring.prob_to_label(sydney['train_prob'],\
+    cutoff = 0.50, labels = ('CAR', 'TRAIN'))
     
 # evaluate performance of logistic regression model    
 # obtain confusion matrix and proportion of observations correctly predicted    
@@ -0,0 +1,36 @@
+# Converting Predicted Probabilities to Class Labels (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# default number of probabilities thresholded per chunk
+DEFAULT_CHUNK_SIZE = 1000000
+
+# map predicted probabilities to labels using one or more cutoffs
+# labels is the pair (label at or below cutoff, label above cutoff),
+# for example ('CAR', 'TRAIN') or (0, 1)... a single cutoff gives
+# one label per probability, a sequence of cutoffs gives a 2-D array
+# with one row of labels per cutoff
+def prob_to_label(prob, cutoff = 0.5, labels = (0, 1)):
+    prob = np.asarray(prob, dtype = np.float64)
+    labels = np.asarray(labels)
+    cutoff = np.asarray(cutoff, dtype = np.float64)
+    if cutoff.ndim == 0:
+        return(labels[(prob > cutoff).astype(np.intp)])
+    return(labels[(prob > cutoff[:, np.newaxis]).astype(np.intp)])
+
+# labels for probabilities chunk by chunk, as for a memory-mapped array
+# of scores... out is an optional (n_cutoffs, n) array to fill, which may
+# itself be a memory-mapped array, so only one chunk is held in memory
+def prob_to_label_chunks(prob, cutoffs, labels = (0, 1), out = None,\
+    chunk_size = DEFAULT_CHUNK_SIZE):
+    cutoffs = np.atleast_1d(np.asarray(cutoffs, dtype = np.float64))
+    labels = np.asarray(labels)
+    if out is None:
+        out = np.empty((len(cutoffs), len(prob)), dtype = labels.dtype)
+    for begin in range(0, len(prob), chunk_size):
+        end = min(begin + chunk_size, len(prob))
+        out[:, begin:end] = prob_to_label(prob[begin:end], cutoffs, labels)
+    return(out)
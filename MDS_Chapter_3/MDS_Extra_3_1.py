@@ -8,65 +8,28 @@ import pandas as pd  # DataFrame structure and operations
 import numpy as np  # arrays and numerical processing
 import matplotlib.pyplot as plt  # 2D plotting
 import statsmodels.api as sm  # logistic regression
-import statsmodels.formula.api as smf  # R-like model specification
-import patsy  # translate model specification into design matrices
 
-# import user-defined module
+# import user-defined modules
+import bank_features
+import design_cache
 import evaluate_classifier as eval
+import lift_chart
+import scoring
 
-# read in comma-delimited text file and create data frame
-# there are blank character fields for missing data
-# read them as character fields initially
-bank = pd.read_csv('bank.csv', sep = ';')
-print(bank.head())
-
-# define jobtype variable
-job_to_jobtype = {'admin.':'White Collar',\
-    'entrepreneur':'White Collar',\
-    'management':'White Collar',\
-    'self-employed':'White Collar',\
-    'blue-collar':'Blue Collar',\
-    'services':'Blue Collar',\
-    'technician':'Blue Collar'}
-bank['jobtype'] = bank['job'].map(job_to_jobtype)
-bank['jobtype'] = bank['jobtype'].fillna('Other/Unknown')
-
-# set marital variable
-marital_to_label = {'divorced':'Divorced',\
-    'married':'Married',\
-    'single':'Single'}
-bank['marital'] = bank['marital'].map(marital_to_label)
-bank['marital'] = bank['marital'].fillna('Unknown')
-
-# set education variable
-education_to_label = {'primary':'Primary',\
-    'secondary':'Secondary',\
-    'tertiary':'Tertiary'}
-bank['education'] = bank['education'].map(education_to_label)
-bank['education'] = bank['education'].fillna('Unknown')
-
-# set no/yes variable labels
-noyes_to_label = {'no':'No', 'yes':'Yes'}
-bank['default'] = bank['default'].map(noyes_to_label)
-bank['default'] = bank['default'].fillna('No')
-
-bank['housing'] = bank['housing'].map(noyes_to_label)
-bank['housing'] = bank['housing'].fillna('No')
-
-bank['loan'] = bank['loan'].map(noyes_to_label)
-bank['loan'] = bank['loan'].fillna('No')
-
-# code response as binary variable
-noyes_to_binary = {'no':0, 'yes':1}
-bank['response'] = bank['response'].map(noyes_to_binary)
-bank['response'] = bank['response'].fillna('No')
+# read the bank file and build features for the targeting model
+# features are built in one pass over bank.csv (see RECODE_TABLES in
+# bank_features for the jobtype, marital, education, and no/yes recodes)
+# and cached as memory-mapped columns keyed by the file contents and
+# recode tables, so later runs load the cache directly
+bank_columns, bank_levels = bank_features.load_bank_features('bank.csv')
 
 # work only with bank clients who are being approached for the first time  
-filter = bank['pdays'].map(lambda d: d == -1)
+filter = (bank_columns['pdays'] == -1)
 
 # apply the filter and select columns needed for targeting model
-bankwork = pd.DataFrame(bank[filter], columns = ['response','age','jobtype',\
-    'education',  'marital', 'default', 'balance', 'housing', 'loan'])
+bankwork = bank_features.to_data_frame(bank_columns, bank_levels,\
+    names = ['response','age','jobtype', 'education',  'marital',\
+    'default', 'balance', 'housing', 'loan'], mask = filter)
 print(bankwork.head()) 
 print(bankwork.shape)   
 
@@ -105,8 +68,11 @@ bank_spec = 'response ~ age + jobtype + education + marital +\
 # ----------------------------------
 # fit logistic regression model 
 # ----------------------------------
-# convert R-like formula into design matrix needed for statsmodels        
-y,x = patsy.dmatrices(bank_spec, bankwork, return_type = 'dataframe')    
+# convert R-like formula into design matrix needed for statsmodels
+# the formula is compiled once... its encoding (including categorical
+# levels) is reused for new rows with bank_design.transform or append
+bank_design = design_cache.compiled_design(bank_spec, bankwork)
+y,x = bank_design.matrices(index = bankwork.index)
 
 my_logit_model = sm.Logit(y,x)
 # fit the model to the full data set
@@ -116,45 +82,53 @@ print(my_logit_model_fit.summary())
 # predicted probability of reponding to the offer
 bankwork['pred_logit_prob'] = my_logit_model_fit.predict(linear = False)
 
-# map target from probability cutoff specified
-def prob_to_pred(x, cutoff):
-    if(x > cutoff):
-        return(1)
-    else:
-        return(0)
-
-# try cutoff set at 0.50
-bankwork['pred_logit_50'] =\
-    bankwork['pred_logit_prob'].\
-    apply(lambda d: prob_to_pred(d, cutoff = 0.50))    
-print('\nConfusion matrix for 0.50 cutoff\n',\
-    pd.crosstab(bankwork.pred_logit_50, bankwork.response, margins = True))    
-# cutoff 0.50 does not work for targeting... all predictions 0 or No    
-
-# try cutoff set at 0.10
-bankwork['pred_logit_10'] =\
-    bankwork['pred_logit_prob'].\
-    apply(lambda d: prob_to_pred(d, cutoff = 0.10))    
-print('\nConfusion matrix for 0.10 cutoff\n',\
-    pd.crosstab(bankwork.pred_logit_10, bankwork.response, margins = True)) 
+# evaluate every distinct cutoff in one pass over sorted probabilities
+# predictions are positive (1) when probability exceeds the cutoff
+cutoff_sweep = eval.sweep_cutoffs(bankwork['pred_logit_prob'],\
+    bankwork['response'], positive = 1)
+
+# confusion matrix counts for cutoffs 0.50 and 0.10 from the sweep
+for cutoff, tp, fp, fn, tn in zip(\
+    *[eval.sweep_at(cutoff_sweep, [0.50, 0.10])[key]\
+    for key in ['cutoff', 'tp', 'fp', 'fn', 'tn']]):
+    print('\nConfusion matrix for', '%0.2f' % cutoff, 'cutoff\n',\
+        '(predicted 0, observed 0):', int(tn),\
+        ' (predicted 0, observed 1):', int(fn), '\n',\
+        '(predicted 1, observed 0):', int(fp),\
+        ' (predicted 1, observed 1):', int(tp))
+# cutoff 0.50 does not work for targeting... all predictions 0 or No
+
+# cutoff with the highest kappa across all distinct cutoffs
+best_kappa_cutoff, best_kappa = eval.best_cutoff(cutoff_sweep, 'kappa')
+print('\nCutoff with highest kappa:', round(best_kappa_cutoff, 4),\
+    ' kappa:', round(best_kappa, 4))
+
+# predictions for cutoff set at 0.10 (1 when probability exceeds cutoff)
+bankwork['pred_logit_10'] = scoring.prob_to_label(\
+    bankwork['pred_logit_prob'], cutoff = 0.10, labels = (0, 1))
 
 print('\n Logistic Regression Performance (0.10 cutoff)\n',\
     'Percentage of Targets Correctly Classified:',\
     100 * round(eval.evaluate_classifier(bankwork['pred_logit_10'],\
     bankwork['response'])[4], 3),'\n')
 
-# direct calculation of lift 
-# decile labels from highest to lowest 
-decile_label = []
-for i in range(10):
-    decile_label.append('Decile_'+str(10 - i))
-# draws on baseline response rate computed earlier    
-def lift(x):
-    return(x / baseline_response_rate)
-
-prediction_deciles = pd.qcut(bankwork.pred_logit_prob, 10, labels = decile_label)
-decile_groups = bankwork.response.groupby(prediction_deciles)
-print(decile_groups.mean())
-lift_values = decile_groups.mean() / baseline_response_rate
+# direct calculation of lift by decile of predicted probability
+# scores and responses are passed to the lift chart module in chunks
+# so the same code works for campaign files too large for memory
+# (see lift_chart.csv_chunks)... make_chunks gives a fresh iterator
+# for each of the two passes (decile edges, then decile counts)
+def make_chunks():
+    return(lift_chart.iterate_chunks(bankwork['pred_logit_prob'],\
+        bankwork['response'], chunk_size = 1000))
+
+lift_results = lift_chart.lift_table(make_chunks, n_bins = 10)
+
+# decile labels from lowest to highest (Decile_1 has highest scores)
+decile_label = lift_results['decile_label']
+print(pd.Series(lift_results['response_rate'], index = decile_label))
+lift_values = pd.Series(lift_results['lift'], index = decile_label)
 print('\nLift Chart Values by Decile:\n', lift_values, '\n')
+gain_values = pd.Series(lift_results['cumulative_gain'],\
+    index = decile_label)
+print('\nCumulative Gains by Decile:\n', gain_values, '\n')
 
@@ -0,0 +1,165 @@
+# Cached Feature Engineering for the Bank Marketing Data (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # file paths for the cache
+import json  # recode tables and levels stored with the cache
+import hashlib  # cache key from file contents and recode tables
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure and operations
+
+# recode tables used in targeting and segmentation
+# each maps source column values to labels, with a label for
+# values missing from the table (including missing data)
+RECODE_TABLES = {
+    'jobtype': {'source': 'job',
+        'map': {'admin.':'White Collar',
+            'entrepreneur':'White Collar',
+            'management':'White Collar',
+            'self-employed':'White Collar',
+            'blue-collar':'Blue Collar',
+            'services':'Blue Collar',
+            'technician':'Blue Collar'},
+        'fill': 'Other/Unknown'},
+    'marital': {'source': 'marital',
+        'map': {'divorced':'Divorced',
+            'married':'Married',
+            'single':'Single'},
+        'fill': 'Unknown'},
+    'education': {'source': 'education',
+        'map': {'primary':'Primary',
+            'secondary':'Secondary',
+            'tertiary':'Tertiary'},
+        'fill': 'Unknown'},
+    'default': {'source': 'default',
+        'map': {'no':'No', 'yes':'Yes'}, 'fill': 'No'},
+    'housing': {'source': 'housing',
+        'map': {'no':'No', 'yes':'Yes'}, 'fill': 'No'},
+    'loan': {'source': 'loan',
+        'map': {'no':'No', 'yes':'Yes'}, 'fill': 'No'}}
+
+# source columns kept as categorical codes of their original values
+RAW_CATEGORICAL_COLUMNS = ['job']
+
+NUMERIC_COLUMNS = ['age', 'balance', 'pdays', 'previous']
+
+# response coded as 0/1
+NOYES_TO_BINARY = {'no':0, 'yes':1}
+
+DEFAULT_CACHE_DIRECTORY = 'bank_feature_cache'
+
+# version of the cached feature format... increase it whenever the
+# feature code changes, so caches built by earlier code are not reused
+CACHE_VERSION = 1
+
+# hash of file contents read in blocks
+def file_hash(file_name, block_size = 1 << 20):
+    digest = hashlib.sha1()
+    with open(file_name, 'rb') as source:
+        block = source.read(block_size)
+        while block:
+            digest.update(block)
+            block = source.read(block_size)
+    return(digest.hexdigest())
+
+# cache key from the source file hash, the recode tables, the columns
+# kept, and the cache version
+def cache_key(file_name, recode_tables = RECODE_TABLES):
+    digest = hashlib.sha1(file_hash(file_name).encode('ascii'))
+    digest.update(json.dumps({'recode_tables': recode_tables,\
+        'numeric_columns': NUMERIC_COLUMNS,\
+        'raw_categorical_columns': RAW_CATEGORICAL_COLUMNS,\
+        'version': CACHE_VERSION}, sort_keys = True).encode('utf-8'))
+    return(digest.hexdigest())
+
+# recode categorical codes through a lookup array (one take per column)
+# code -1 (missing data) picks up the fill code at the end of the lookup
+def recode_categorical(values, table):
+    labels = sorted(set(table['map'].values()) | set([table['fill']]))
+    label_code = dict((label, code) for code, label in enumerate(labels))
+    categories = list(values.cat.categories)
+    lookup = np.array([label_code[table['map'].get(category,\
+        table['fill'])] for category in categories] +\
+        [label_code[table['fill']]], dtype = np.int8)
+    return(np.take(lookup, values.cat.codes.values), labels)
+
+# parse the bank file once and build all feature columns
+# string columns are parsed directly as categorical data
+# returns dictionaries of column arrays and of categorical levels
+def build_bank_features(file_name = 'bank.csv',\
+    recode_tables = RECODE_TABLES):
+    categorical_sources = sorted(set([table['source']\
+        for table in recode_tables.values()] + RAW_CATEGORICAL_COLUMNS))
+    dtypes = dict((name, 'category') for name in\
+        categorical_sources + ['response'])
+    bank = pd.read_csv(file_name, sep = ';', dtype = dtypes,\
+        usecols = categorical_sources + NUMERIC_COLUMNS + ['response'])
+    columns = {}
+    levels = {}
+    for name in NUMERIC_COLUMNS:
+        columns[name] = bank[name].values
+    for name, table in recode_tables.items():
+        columns[name], levels[name] =\
+            recode_categorical(bank[table['source']], table)
+    for name in RAW_CATEGORICAL_COLUMNS:
+        columns[name] = bank[name].cat.codes.values.astype(np.int8)
+        levels[name] = [str(level) for level in bank[name].cat.categories]
+    response_table = {'map': NOYES_TO_BINARY, 'fill': 0}
+    response_codes, response_labels =\
+        recode_categorical(bank['response'], response_table)
+    columns['response'] = np.take(np.array(response_labels,\
+        dtype = np.int8), response_codes)
+    return(columns, levels)
+
+# load bank features from the cache, building and saving them first
+# if the file, recode tables, columns, or cache version have changed...
+# columns are returned as read-only memory-mapped arrays, one .npy file
+# per column
+def load_bank_features(file_name = 'bank.csv',\
+    recode_tables = RECODE_TABLES, cache_directory = None):
+    if cache_directory is None:
+        cache_directory = os.path.join(os.path.dirname(file_name),\
+            DEFAULT_CACHE_DIRECTORY)
+    directory = os.path.join(cache_directory,\
+        cache_key(file_name, recode_tables))
+    levels_file = os.path.join(directory, 'levels.json')
+    if not os.path.exists(levels_file):
+        columns, levels = build_bank_features(file_name, recode_tables)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        for name, values in columns.items():
+            np.save(os.path.join(directory, name + '.npy'), values)
+        # levels file written last marks the cache entry as complete
+        with open(levels_file, 'w') as levels_output:
+            json.dump({'columns': sorted(columns), 'levels': levels},\
+                levels_output)
+    with open(levels_file) as levels_input:
+        metadata = json.load(levels_input)
+    columns = dict((name, np.load(os.path.join(directory, name + '.npy'),\
+        mmap_mode = 'r')) for name in metadata['columns'])
+    return(columns, metadata['levels'])
+
+# boolean indicator for rows whose categorical value is in values
+def indicator(columns, levels, name, values):
+    lookup = np.array([level in values for level in levels[name]])
+    return(lookup[columns[name]])
+
+# pandas DataFrame view of the features with categorical columns
+# rows can be selected with a boolean mask before building the frame
+# levels no row uses (a fill label, or levels outside the mask) are
+# dropped, so model formulas see only the levels present, as they
+# would with string columns
+def to_data_frame(columns, levels, names = None, mask = None):
+    if names is None:
+        names = sorted(columns)
+    data = {}
+    for name in names:
+        values = columns[name] if mask is None else columns[name][mask]
+        if name in levels:
+            data[name] = pd.Categorical.from_codes(values,\
+                levels[name]).remove_unused_categories()
+        else:
+            data[name] = np.asarray(values)
+    return(pd.DataFrame(data, columns = names))
@@ -0,0 +1,182 @@
+# Streaming Lift Chart and Cumulative Gains by Decile (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # chunked reading of comma-delimited text files
+
+# default number of items kept per level of the quantile sketch
+# sketches with no more than this many items give exact quantiles
+DEFAULT_SKETCH_CAPACITY = 4096
+
+# mergeable quantile sketch (compactor levels in the style of KLL)
+# each level holds items of weight 2**level... when a level overflows
+# it is sorted and every other item is promoted to the next level,
+# so memory grows with the log of the number of items seen
+class QuantileSketch(object):
+
+    def __init__(self, capacity = DEFAULT_SKETCH_CAPACITY, seed = 9999):
+        self.capacity = capacity
+        self.levels = [np.zeros(0)]
+        self.count = 0
+        self.random_state = np.random.RandomState(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype = np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self.count = self.count + len(values)
+        self._compact()
+        return(self)
+
+    # combine with a sketch built on another chunk or another worker
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.zeros(0))
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count = self.count + other.count
+        self._compact()
+        return(self)
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # keep one item back when the count is odd
+                carry = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:len(items) - len(carry)]
+                offset = self.random_state.randint(2)
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                self.levels[level + 1] = np.concatenate((\
+                    self.levels[level + 1], items[offset::2]))
+                self.levels[level] = carry
+            level = level + 1
+
+    # quantiles for probabilities in q... exact (with linear interpolation
+    # as in numpy and pandas qcut) until the first compaction
+    def quantiles(self, q):
+        q = np.asarray(q, dtype = np.float64)
+        if len(self.levels) == 1:
+            return(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.repeat(2.0 ** level, len(level_items))\
+            for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind = 'mergesort')
+        items = items[order]
+        cumulative_weights = np.cumsum(weights[order])
+        rows = np.searchsorted(cumulative_weights,\
+            q * cumulative_weights[-1], side = 'left')
+        return(items[np.minimum(rows, len(items) - 1)])
+
+    # approximate proportion of items at or below each value
+    def cdf(self, values):
+        values = np.asarray(values, dtype = np.float64)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.repeat(2.0 ** level, len(level_items))\
+            for level, level_items in enumerate(self.levels)])
+        if len(items) == 0:
+            return(np.zeros(values.shape))
+        order = np.argsort(items, kind = 'mergesort')
+        cumulative_weights = np.concatenate(([0.0],\
+            np.cumsum(weights[order])))
+        rows = np.searchsorted(items[order], values, side = 'right')
+        return(cumulative_weights[rows] / cumulative_weights[-1])
+
+# split in-memory score and response arrays into aligned chunks
+def iterate_chunks(scores, responses, chunk_size = 100000):
+    scores = np.asarray(scores)
+    responses = np.asarray(responses)
+    for begin in range(0, len(scores), chunk_size):
+        end = begin + chunk_size
+        yield(scores[begin:end], responses[begin:end])
+
+# read (score, response) chunks from a delimited text file
+# only the two columns are parsed and only one chunk is held in memory
+def csv_chunks(file_name, score_column, response_column,\
+    chunk_size = 100000, sep = ','):
+    for chunk in pd.read_csv(file_name, sep = sep, chunksize = chunk_size,\
+        usecols = [score_column, response_column]):
+        yield(chunk[score_column].values, chunk[response_column].values)
+
+# first pass: sketch of all scores and of responder scores with totals
+def score_sketches(chunks, capacity = DEFAULT_SKETCH_CAPACITY,\
+    positive = 1):
+    score_sketch = QuantileSketch(capacity)
+    responder_sketch = QuantileSketch(capacity)
+    n = 0
+    responders = 0
+    for scores, responses in chunks:
+        is_responder = (np.asarray(responses) == positive)
+        scores = np.asarray(scores, dtype = np.float64)
+        score_sketch.update(scores)
+        responder_sketch.update(scores[is_responder])
+        n = n + len(scores)
+        responders = responders + int(np.count_nonzero(is_responder))
+    return(score_sketch, responder_sketch, n, responders)
+
+# bin edges at quantiles of the score distribution (n_bins + 1 values)
+def decile_edges(score_sketch, n_bins = 10):
+    return(score_sketch.quantiles(np.linspace(0, 1, n_bins + 1)))
+
+# second pass: exact per-bin counts given edges
+# bins are closed on the right as with pandas qcut
+def decile_counts(chunks, edges, positive = 1):
+    n_bins = len(edges) - 1
+    counts = np.zeros(n_bins, dtype = np.int64)
+    responders = np.zeros(n_bins, dtype = np.int64)
+    for scores, responses in chunks:
+        bins = np.searchsorted(edges[1:-1],\
+            np.asarray(scores, dtype = np.float64), side = 'left')
+        counts = counts + np.bincount(bins, minlength = n_bins)
+        responders = responders + np.bincount(bins,\
+            weights = (np.asarray(responses) == positive),\
+            minlength = n_bins).astype(np.int64)
+    return(counts, responders)
+
+# response rate, lift and cumulative gains from per-bin counts
+# bins are ordered from lowest to highest score, labeled so that
+# Decile_1 holds the highest scores (as in the targeting script)
+def lift_from_counts(counts, responders, edges = None):
+    counts = np.asarray(counts, dtype = np.float64)
+    responders = np.asarray(responders, dtype = np.float64)
+    n_bins = len(counts)
+    baseline_response_rate = responders.sum() / counts.sum()
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        response_rate = responders / counts
+    # cumulative share of all responders captured from the top bin down
+    cumulative_gain = np.cumsum(responders[::-1])[::-1] / responders.sum()
+    return({'decile_label': ['Decile_' + str(n_bins - i)\
+            for i in range(n_bins)],
+        'edges': edges,
+        'count': counts,
+        'responders': responders,
+        'response_rate': response_rate,
+        'lift': response_rate / baseline_response_rate,
+        'cumulative_gain': cumulative_gain,
+        'baseline_response_rate': baseline_response_rate})
+
+# lift table over data too large for memory
+# make_chunks is a function returning a fresh iterator of
+# (score, response) chunks... called twice for exact bin counts,
+# or once with one_pass = True, in which case responders per bin
+# are estimated from the responder score sketch
+def lift_table(make_chunks, n_bins = 10, one_pass = False,\
+    capacity = DEFAULT_SKETCH_CAPACITY, positive = 1):
+    score_sketch, responder_sketch, n, n_responders =\
+        score_sketches(make_chunks(), capacity, positive)
+    edges = decile_edges(score_sketch, n_bins)
+    if one_pass:
+        interior = np.concatenate(([0.0],\
+            score_sketch.cdf(edges[1:-1]), [1.0]))
+        counts = n * np.diff(interior)
+        responder_interior = np.concatenate(([0.0],\
+            responder_sketch.cdf(edges[1:-1]), [1.0]))
+        responders = n_responders * np.diff(responder_interior)
+    else:
+        counts, responders = decile_counts(make_chunks(), edges, positive)
+    return(lift_from_counts(counts, responders, edges))
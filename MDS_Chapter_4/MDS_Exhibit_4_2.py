@@ -6,11 +6,17 @@ from __future__ import division, print_function
 # import packages for multivariate analysis
 import pandas as pd  # DataFrame structure and operations
 import numpy as np  # arrays and numerical processing
-from sklearn.cluster import KMeans  # cluster analysis by partitioning
-from sklearn.metrics import silhouette_score as silhouette_score
 
-# read data from comma-delimited text file... create DataFrame object
-bank = pd.read_csv('bank.csv', sep = ';')
+# import user-defined modules
+import bank_features
+import select_clusters
+import streaming_segmentation
+
+# read bank features... built in one pass over bank.csv and cached as
+# memory-mapped columns keyed by the file contents and recode tables,
+# so later runs load the cache directly... create DataFrame object
+bank_columns, bank_levels = bank_features.load_bank_features('bank.csv')
+bank = bank_features.to_data_frame(bank_columns, bank_levels)
 print(bank.head)  # check the structure of the data frame
 print(bank.shape)
 # look at the list of column names
@@ -26,14 +32,13 @@ print(bank['job'].unique())
 print(bank['job'].value_counts(sort = True))
 print(bank['job'].describe())  
 
-# define job indicator variables
-job_indicators = pd.get_dummies(bank['job'], prefix = 'job')
-print(job_indicators.head())
-bank = bank.join(job_indicators)
-bank['whitecollar'] = bank['job_admin.'] + bank['job_management'] + \
-    bank['job_entrepreneur'] + bank['job_self-employed']
-bank['bluecollar'] = bank['job_blue-collar'] + bank['job_services'] + \
-    bank['job_technician'] + bank['job_housemaid']
+# define job indicator variables from the cached categorical codes
+bank['whitecollar'] = bank_features.indicator(bank_columns, bank_levels,\
+    'job', ['admin.', 'management', 'entrepreneur', 'self-employed'])\
+    .astype(np.uint8)
+bank['bluecollar'] = bank_features.indicator(bank_columns, bank_levels,\
+    'job', ['blue-collar', 'services', 'technician', 'housemaid'])\
+    .astype(np.uint8)
 
 # examine the demographic variable marital
 print(bank['marital'].unique())
@@ -41,11 +46,10 @@ print(bank['marital'].value_counts(sort = True))
 print(bank['marital'].describe())  
 
 # define marital indicator variables
-marital_indicators = pd.get_dummies(bank['marital'], prefix = 'marital')
-print(marital_indicators.head())
-bank = bank.join(marital_indicators)
-bank['divorced'] = bank['marital_divorced']
-bank['married'] = bank['marital_married']
+bank['divorced'] = bank_features.indicator(bank_columns, bank_levels,\
+    'marital', ['Divorced']).astype(np.uint8)
+bank['married'] = bank_features.indicator(bank_columns, bank_levels,\
+    'marital', ['Married']).astype(np.uint8)
 
 # examine the demographic variable education
 print(bank['education'].unique())
@@ -53,12 +57,12 @@ print(bank['education'].value_counts(sort = True))
 print(bank['education'].describe())  
 
 # define education indicator variables
-education_indicators = pd.get_dummies(bank['education'], prefix = 'education')
-print(education_indicators.head())
-bank = bank.join(education_indicators)
-bank['primary'] = bank['education_primary']
-bank['secondary'] = bank['education_secondary']
-bank['tertiary'] = bank['education_tertiary']
+bank['primary'] = bank_features.indicator(bank_columns, bank_levels,\
+    'education', ['Primary']).astype(np.uint8)
+bank['secondary'] = bank_features.indicator(bank_columns, bank_levels,\
+    'education', ['Secondary']).astype(np.uint8)
+bank['tertiary'] = bank_features.indicator(bank_columns, bank_levels,\
+    'education', ['Tertiary']).astype(np.uint8)
 
 print(bank.head)  # check the structure of the data frame
 print(bank.shape)
@@ -91,20 +95,36 @@ data_for_clustering = pd.DataFrame(bank_selected, \
 data_for_clustering_matrix = data_for_clustering.as_matrix()               
   
 # investigate alternative numbers of clusters using silhouette score
-silhouette_value = []
-k = range(2,21)  # look at solutions between 2 and 20 clusters
-for i in k:
-    clustering_method = KMeans(n_clusters = i, random_state = 9999)
-    clustering_method.fit(data_for_clustering_matrix)
-    labels = clustering_method.predict(data_for_clustering_matrix)
-    silhouette_average = silhouette_score(data_for_clustering_matrix, labels)
-    silhouette_value.append(silhouette_average)    
-              
-# highest silhouette score is for two clusters
-# so we use that clustering solution here   
-clustering_method = KMeans(n_clusters = 2, random_state = 9999)
-clustering_method.fit(data_for_clustering_matrix)
-labels = clustering_method.predict(data_for_clustering_matrix)
+# candidate solutions between 2 and 20 clusters are fit in a process pool
+# with silhouette estimated on a stratified sample of 5000 cases,
+# stopping early once the score has clearly peaked
+best_k, k_results = select_clusters.select_k(data_for_clustering_matrix,\
+    k_values = range(2, 21), sample_size = 5000)
+for result in k_results:
+    print('k:', result['k'],\
+        ' silhouette:', round(result['silhouette'], 4),\
+        ' fit seconds:', round(result['fit_seconds'], 2),\
+        ' score seconds:', round(result['score_seconds'], 2))
+silhouette_value = [result['silhouette'] for result in k_results]
+print('\nNumber of clusters with highest silhouette score:', best_k)
+
+# use the solution with the highest silhouette score, as already fit
+# by select_k on the full data
+clustering_method = [result['model'] for result in k_results\
+    if result['k'] == best_k][0]
+labels = clustering_method.labels_  # assignments from the fit itself
+
+# streaming segmentation mode for bank files larger than memory
+# the file is read in chunks of 1000 rows, indicator variables are built
+# per chunk, and centroids are updated incrementally (mini-batch k-means)
+# over the chunks, then one more pass assigns each case to its nearest
+# final center
+streaming_solution = streaming_segmentation.segment_bank_file('bank.csv',\
+    n_clusters = best_k, chunk_size = 1000)
+print('\nStreaming segmentation cluster centers:\n',\
+    pd.DataFrame(streaming_solution['centers'],\
+    columns = streaming_segmentation.FEATURE_NAMES))
+print(pd.crosstab(labels, streaming_solution['labels']))
 
 # add cluster labels to bankfull and review the solution 
 bankfull['cluster'] = labels
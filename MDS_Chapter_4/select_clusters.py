@@ -0,0 +1,150 @@
+# Selecting the Number of Clusters in Parallel (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import time  # timing of model fits
+import multiprocessing  # process pool for candidate numbers of clusters
+
+import numpy as np  # arrays and numerical processing
+from sklearn.cluster import KMeans  # cluster analysis by partitioning
+
+# import user-defined module
+import process_pool
+
+# data matrix shared with worker processes
+# set once per worker by the pool initializer rather than sent per task
+_shared_data = None
+
+def _set_shared_data(data):
+    global _shared_data
+    _shared_data = data
+
+# stratified random sample of row indices... each cluster contributes
+# in proportion to its size, with at least one row per cluster
+def stratified_sample(labels, sample_size, random_state = 9999):
+    labels = np.asarray(labels)
+    if sample_size >= len(labels):
+        return(np.arange(len(labels)))
+    rng = np.random.RandomState(random_state)
+    order = np.argsort(labels, kind = 'mergesort')
+    cluster_sizes = np.bincount(labels)
+    cluster_starts = np.concatenate(([0], np.cumsum(cluster_sizes)[:-1]))
+    allocation = np.maximum(1, np.round(\
+        sample_size * cluster_sizes / len(labels)).astype(np.int64))
+    allocation = np.minimum(allocation, cluster_sizes)
+    sample = [order[start + rng.choice(size, count, replace = False)]\
+        for start, size, count in\
+        zip(cluster_starts, cluster_sizes, allocation) if size > 0]
+    return(np.sort(np.concatenate(sample)))
+
+# silhouette coefficient computed in blocks of rows
+# memory is block_size x n distances instead of n x n
+# single-member clusters score zero, as in sklearn silhouette_score
+def blocked_silhouette(data, labels, block_size = 1000):
+    data = np.asarray(data, dtype = np.float64)
+    labels = np.asarray(labels)
+    n_clusters = labels.max() + 1
+    cluster_sizes = np.bincount(labels, minlength = n_clusters)
+    indicators = np.zeros((len(labels), n_clusters))
+    indicators[np.arange(len(labels)), labels] = 1.0
+    squared_norms = np.einsum('ij,ij->i', data, data)
+    silhouette_values = np.zeros(len(labels))
+    for begin in range(0, len(labels), block_size):
+        end = min(begin + block_size, len(labels))
+        squared = squared_norms[begin:end, np.newaxis] + squared_norms\
+            - 2 * np.dot(data[begin:end], data.T)
+        distances = np.sqrt(np.maximum(squared, 0))
+        # sum of distances from each row in block to members of each cluster
+        cluster_sums = np.dot(distances, indicators)
+        own = labels[begin:end]
+        rows = np.arange(end - begin)
+        own_sizes = cluster_sizes[own]
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            a = cluster_sums[rows, own] / (own_sizes - 1)
+            mean_distances = cluster_sums / cluster_sizes
+        mean_distances[rows, own] = np.inf
+        b = mean_distances.min(axis = 1)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            values = (b - a) / np.maximum(a, b)
+        silhouette_values[begin:end] = np.where(own_sizes > 1,\
+            np.nan_to_num(values), 0.0)
+    return(silhouette_values.mean())
+
+# silhouette estimate from a stratified sample of the rows
+def silhouette_estimate(data, labels, sample_size = 5000,\
+    block_size = 1000, random_state = 9999):
+    labels = np.asarray(labels)
+    sample = stratified_sample(labels, sample_size, random_state)
+    # relabel so that cluster codes are consecutive within the sample
+    sample_labels = np.unique(labels[sample], return_inverse = True)[1]
+    return(blocked_silhouette(np.asarray(data)[sample], sample_labels,\
+        block_size))
+
+# fit one candidate number of clusters on the shared data
+# labels come from the fit itself, no separate predict pass, and the
+# fitted model is returned with the scores so it need not be refit
+def fit_candidate(k, random_state = 9999, sample_size = 5000,\
+    block_size = 1000):
+    data = _shared_data
+    start = time.time()
+    clustering_method = KMeans(n_clusters = k, random_state = random_state)
+    clustering_method.fit(data)
+    fit_seconds = time.time() - start
+    start = time.time()
+    silhouette = silhouette_estimate(data, clustering_method.labels_,\
+        sample_size, block_size, random_state)
+    score_seconds = time.time() - start
+    return({'k': k, 'silhouette': float(silhouette),\
+        'inertia': float(clustering_method.inertia_),\
+        'model': clustering_method,\
+        'fit_seconds': fit_seconds, 'score_seconds': score_seconds})
+
+def _fit_candidate_task(task):
+    return(fit_candidate(*task))
+
+# the score has clearly peaked when the last patience candidates
+# all fall more than tolerance below the best score so far
+def has_peaked(results, patience = 3, tolerance = 0.01):
+    scores = [result['silhouette'] for result in results]
+    best_index = int(np.argmax(scores))
+    trailing = scores[best_index + 1:]
+    return(len(trailing) >= patience and\
+        max(trailing[-patience:]) < scores[best_index] - tolerance)
+
+# fit candidate numbers of clusters in a process pool, in waves of
+# n_jobs candidates in increasing order of k, stopping after a wave
+# once the silhouette score has clearly peaked (one candidate at a
+# time in this process when n_jobs is 1)
+# returns the chosen k and per-k results (scores, timings, and the
+# fitted KMeans model)
+def select_k(data, k_values = range(2, 21), n_jobs = None,\
+    sample_size = 5000, block_size = 1000, patience = 3,\
+    tolerance = 0.01, random_state = 9999):
+    data = np.ascontiguousarray(data, dtype = np.float64)
+    k_values = list(k_values)
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs()
+    results = []
+    if n_jobs == 1:
+        _set_shared_data(data)
+        for k in k_values:
+            results.append(fit_candidate(k, random_state, sample_size,\
+                block_size))
+            if has_peaked(results, patience, tolerance):
+                break
+    else:
+        pool = multiprocessing.Pool(processes = n_jobs,\
+            initializer = _set_shared_data, initargs = (data,))
+        try:
+            for begin in range(0, len(k_values), n_jobs):
+                tasks = [(k, random_state, sample_size, block_size)\
+                    for k in k_values[begin:begin + n_jobs]]
+                results.extend(pool.map(_fit_candidate_task, tasks))
+                if has_peaked(results, patience, tolerance):
+                    break
+        finally:
+            pool.close()
+            pool.join()
+    best = max(results, key = lambda result: result['silhouette'])
+    return(best['k'], results)
@@ -0,0 +1,75 @@
+# Streaming Segmentation of Bank Customers (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # chunked reading of delimited text files
+from sklearn.cluster import MiniBatchKMeans  # incremental cluster analysis
+
+# columns read from the bank file... others are never parsed
+BANK_COLUMNS = ['age', 'job', 'marital', 'education', 'previous', 'response']
+
+# indicator variables for cluster analysis as in the segmentation script
+JOB_WHITECOLLAR = ['admin.', 'management', 'entrepreneur', 'self-employed']
+JOB_BLUECOLLAR = ['blue-collar', 'services', 'technician', 'housemaid']
+
+FEATURE_NAMES = ['age', 'whitecollar', 'bluecollar', 'divorced', 'married',
+    'primary', 'secondary', 'tertiary']
+
+# build the feature matrix for one chunk of the bank file
+# fixed indicator definitions give the same columns for every chunk
+# (pd.get_dummies would only create columns for levels in the chunk)
+def chunk_features(chunk):
+    features = np.empty((len(chunk), len(FEATURE_NAMES)), dtype = np.float64)
+    features[:, 0] = chunk['age'].values
+    features[:, 1] = chunk['job'].isin(JOB_WHITECOLLAR).values
+    features[:, 2] = chunk['job'].isin(JOB_BLUECOLLAR).values
+    features[:, 3] = (chunk['marital'].values == 'divorced')
+    features[:, 4] = (chunk['marital'].values == 'married')
+    features[:, 5] = (chunk['education'].values == 'primary')
+    features[:, 6] = (chunk['education'].values == 'secondary')
+    features[:, 7] = (chunk['education'].values == 'tertiary')
+    return(features)
+
+# iterate over feature matrices for cases never previously contacted
+# only one chunk of the file is held in memory at a time
+def bank_feature_chunks(file_name = 'bank.csv', chunk_size = 100000):
+    for chunk in pd.read_csv(file_name, sep = ';', chunksize = chunk_size,\
+        usecols = BANK_COLUMNS):
+        chunk = chunk[chunk['previous'].values == 0]
+        if len(chunk) > 0:
+            yield(chunk_features(chunk))
+
+# mini-batch k-means over chunks from make_chunks (a function returning
+# a fresh iterator of feature matrices for each pass over the data)
+# centroids are updated incrementally for n_passes passes... cluster
+# labels and inertia come from one pass after fitting, with the
+# distances of each chunk to the returned centers computed once
+def streaming_kmeans(make_chunks, n_clusters, n_passes = 3,\
+    random_state = 9999):
+    clustering_method = MiniBatchKMeans(n_clusters = n_clusters,\
+        random_state = random_state, compute_labels = False)
+    for current_pass in range(n_passes):
+        for features in make_chunks():
+            clustering_method.partial_fit(features)
+    labels = []
+    inertia = 0.0
+    for features in make_chunks():
+        distances = clustering_method.transform(features)
+        nearest = distances.argmin(axis = 1)
+        labels.append(nearest.astype(np.int32))
+        inertia = inertia +\
+            (distances[np.arange(len(nearest)), nearest] ** 2).sum()
+    return({'centers': clustering_method.cluster_centers_,\
+        'labels': np.concatenate(labels),\
+        'inertia': inertia,\
+        'model': clustering_method})
+
+# segmentation of the bank file with a fixed memory budget
+# set by chunk_size (the number of rows parsed at a time)
+def segment_bank_file(file_name = 'bank.csv', n_clusters = 2,\
+    chunk_size = 100000, n_passes = 3, random_state = 9999):
+    def make_chunks():
+        return(bank_feature_chunks(file_name, chunk_size))
+    return(streaming_kmeans(make_chunks, n_clusters, n_passes, random_state))
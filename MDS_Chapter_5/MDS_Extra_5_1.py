@@ -5,16 +5,14 @@ from __future__ import division, print_function
 
 # import packages for text processing and machine learning
 import pandas as pd  # DataFrame structure and operations
-import numpy as np  # arrays and numerical processing
 import matplotlib.pyplot as plt  # 2D plotting
-import statsmodels.api as sm  # logistic regression
-import statsmodels.formula.api as smf  # R-like model specification
-import patsy  # translate model specification into design matrices
-from sklearn import svm  # support vector machines
-from sklearn.ensemble import RandomForestClassifier  # random forests
-from sklearn.naive_bayes import GaussianNB  # naive Bayes
-
-# import user-defined module
+
+# import user-defined modules
+import compare_models
+import cross_validation
+import design_cache
+import recode
+import scoring
 import evaluate_classifier as eval
 
 # read in comma-delimited text file and create data frame
@@ -23,47 +21,48 @@ import evaluate_classifier as eval
 att = pd.read_csv("att.csv")
 print(att.head())
 
-# select variables of interest for modeling
-attprelim = pd.DataFrame(att, columns = ['pick','usage','reachout','card'])
-
 # use dictionary objects for mapping to 0/1 binary codes
+# the categorical variables of interest are recoded in one pass
 pick_to_binary = {'ATT' : 0, 'OCC' : 1}
-attprelim['pick'] = attprelim['pick'].map(pick_to_binary)
-yes_to_binary = {'NO' : 0, 'YES' : 1}
-attprelim['reachout'] = attprelim['reachout'].map(yes_to_binary)
-attprelim['card'] = attprelim['card'].map(yes_to_binary)
+binary_codes = recode.recode_columns(att, [('pick', pick_to_binary),\
+    ('reachout', recode.YES_TO_BINARY), ('card', recode.YES_TO_BINARY)])
 
 # work with complete cases only
-attwork = attprelim.dropna()
+complete = recode.complete_rows(binary_codes) & att['usage'].notnull().values
+attwork = pd.DataFrame(binary_codes[complete],\
+    columns = ['pick','reachout','card'], index = att.index[complete])
+attwork['usage'] = att['usage'][complete]
 print(attwork.head())
 
 # specify form of predictive model
 attmodel = 'pick ~ usage + reachout + card'
 
-# convert R-like formula into design matrix needed for statsmodels        
-y,x = patsy.dmatrices(attmodel,\
-    attwork, return_type = 'dataframe')    
+# convert R-like formula into design matrix needed for statsmodels
+# the formula is compiled once... its encoding is reused for new rows
+# with att_design.transform or att_design.append
+att_design = design_cache.compiled_design(attmodel, attwork)
+y,x = att_design.matrices(index = attwork.index)
+
+# logistic regression, support vector machines, random forests,
+# and naive Bayes are fit concurrently in a process pool on the same
+# design matrix, and their predictions are scored together in one
+# evaluation pass... fit and predict times are reported for each model
+model_comparison = compare_models.compare_models(x, y)
 
 # --------------------------------------
 # Logistic regression method
 # --------------------------------------
-my_logit_model = sm.Logit(y,x)
-# fit the model to the full data set
-my_logit_model_fit = my_logit_model.fit()
-print(my_logit_model_fit.summary())
+# the logistic regression fit to the full data set by compare_models
+my_logit_model_fit =\
+    model_comparison.loc['Logistic Regression', 'model'].model_fit
+print(my_logit_model_fit.summary(yname = 'pick', xname = list(x.columns)))
 
 # predicted probability of switching to OCC
 attwork['pred_logit_prob'] = my_logit_model_fit.predict(linear = False)
 
 # map from probability to ATT (0) or OCC (1)
-def prob_to_pred(x):
-    if(x > 0.5):
-        return(1)
-    else:
-        return(0)
-
-attwork['pred_logit'] =\
-    attwork['pred_logit_prob'].apply(lambda d: prob_to_pred(d))
+attwork['pred_logit'] = scoring.prob_to_label(attwork['pred_logit_prob'],\
+    cutoff = 0.5, labels = (0, 1))
 
 print('\n Logistic Regression Performance\n',\
     'Percentage of Choices Correctly Classified:',\
@@ -71,44 +70,27 @@ print('\n Logistic Regression Performance\n',\
     attwork['pick'])[4], 3),'\n')
 
 # --------------------------------------
-# Support vector machines
+# Comparison of alternative classifiers
 # --------------------------------------
-my_svm = svm.SVC()  
-my_svm_fit = my_svm.fit(x, np.ravel(y))
-attwork['pred_svm_binary'] = my_svm_fit.predict(x)
+print(model_comparison[['predictive_accuracy', 'kappa',\
+    'fit_seconds', 'predict_seconds']])
 
-print('\n Support Vector Machine Performance\n',\
-    'Percentage of Choices Correctly Classified:',\
-    100 * round(eval.evaluate_classifier(attwork['pred_svm_binary'],\
-    attwork['pick'])[4], 3),'\n')
+for model_name in model_comparison.index:
+    print('\n', model_name, 'Performance\n',\
+        'Percentage of Choices Correctly Classified:',\
+        100 * round(model_comparison.loc[model_name,\
+        'predictive_accuracy'], 3),'\n')
 
 # --------------------------------------
-# Random forests
+# Cross-validation of alternative classifiers
 # --------------------------------------
-# for reproducibility set random number seed with random_state
-my_rf_model = RandomForestClassifier(n_estimators = 10, random_state = 9999)
-my_rf_model_fit = my_rf_model.fit(x, np.ravel(y))
-attwork['pred_rf_binary'] = my_rf_model_fit.predict(x)
-
-print('\n Random Forest Performance\n',\
-    'Percentage of Choices Correctly Classified:',\
-    100 * round(eval.evaluate_classifier(attwork['pred_rf_binary'],\
-    attwork['pick'])[4], 3),'\n')
-
-# --------------------------------------
-# Naive Bayes
-# --------------------------------------
-my_nb_model = GaussianNB()
-my_nb_model_fit = my_nb_model.fit(x, np.ravel(y))
-attwork['pred_nb_binary'] = my_nb_model_fit.predict(x)
-
-print('\n Naive Bayes Performance\n',\
-    'Percentage of Choices Classified:',\
-    100 * round(eval.evaluate_classifier(attwork['pred_rf_binary'],\
-    attwork['pick'])[4], 3),'\n')
-
-# for training and test, utilize scikit-laearn cross-validation
-
-
-
-
+# five-fold cross-validation for out-of-sample performance
+# fold indices are built once and all folds x models are fit in a
+# process pool sharing one memory-mapped copy of the design matrix
+fold_results = cross_validation.cross_validate(x, y, n_folds = 5)
+print(fold_results[['predictive_accuracy', 'kappa']])
+
+print('\n Cross-Validated Performance (mean across folds)\n',\
+    cross_validation.summarize_folds(fold_results)\
+    [['predictive_accuracy', 'true_positive_rate',\
+    'false_positive_rate', 'kappa']], '\n')
@@ -0,0 +1,106 @@
+# Batched Training and Scoring of Alternative Classifiers (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import time  # timing of model fits and predictions
+import multiprocessing  # process pool for fitting models concurrently
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for the results table
+import statsmodels.api as sm  # logistic regression
+from sklearn import svm  # support vector machines
+from sklearn.ensemble import RandomForestClassifier  # random forests
+from sklearn.naive_bayes import GaussianNB  # naive Bayes
+
+# import user-defined modules
+import evaluate_classifier as eval
+import process_pool
+
+# names of the eleven statistics returned by evaluate_classifier
+STATISTIC_NAMES = ['a', 'b', 'c', 'd', 'predictive_accuracy',
+    'true_positive_rate', 'specificity', 'false_positive_rate',
+    'precision', 'expected_accuracy', 'kappa']
+
+# logistic regression with the fit/predict interface of scikit-learn
+# predictions are 1 when the predicted probability exceeds the cutoff
+class LogitClassifier(object):
+
+    def __init__(self, cutoff = 0.5):
+        self.cutoff = cutoff
+
+    def fit(self, x, y):
+        self.model_fit = sm.Logit(y, x).fit(disp = 0)
+        return(self)
+
+    def predict(self, x):
+        return((self.model_fit.predict(x) > self.cutoff).astype(np.int8))
+
+# candidate models for the churn comparison as in the retention script
+def default_models():
+    return([('Logistic Regression', LogitClassifier()),
+        ('Support Vector Machine', svm.SVC()),
+        ('Random Forest',\
+            RandomForestClassifier(n_estimators = 10, random_state = 9999)),
+        ('Naive Bayes', GaussianNB())])
+
+# design matrix and response shared with worker processes
+# set once per worker by the pool initializer rather than sent per task
+_shared_x = None
+_shared_y = None
+
+def _set_shared_data(x, y):
+    global _shared_x, _shared_y
+    _shared_x = x
+    _shared_y = y
+
+# fit one model on the shared data and predict for the same rows
+def fit_and_predict(name, model):
+    start = time.time()
+    model_fit = model.fit(_shared_x, _shared_y)
+    fit_seconds = time.time() - start
+    start = time.time()
+    predicted = np.asarray(model_fit.predict(_shared_x))
+    predict_seconds = time.time() - start
+    return(name, predicted, fit_seconds, predict_seconds, model_fit)
+
+def _fit_and_predict_task(task):
+    return(fit_and_predict(*task))
+
+# fit candidate models concurrently on one read-only design matrix
+# (in this process when n_jobs is 1), then score all predictions
+# together in a single evaluation pass
+# returns a DataFrame with one row per model: the eleven statistics
+# from evaluate_classifier, fit and predict times in seconds, and the
+# fitted model (so a model need not be refit for its summary)
+def compare_models(x, y, models = None, n_jobs = None):
+    x = np.ascontiguousarray(x, dtype = np.float64)
+    y = np.ravel(np.asarray(y))
+    if models is None:
+        models = default_models()
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs(len(models))
+    if n_jobs == 1:
+        _set_shared_data(x, y)
+        fitted = [_fit_and_predict_task(model) for model in models]
+    else:
+        pool = multiprocessing.Pool(processes = n_jobs,\
+            initializer = _set_shared_data, initargs = (x, y))
+        try:
+            fitted = pool.map(_fit_and_predict_task, models)
+        finally:
+            pool.close()
+            pool.join()
+    names = [result[0] for result in fitted]
+    predicted_matrix = np.vstack([result[1] for result in fitted])
+    statistics = eval.evaluate_classifiers(predicted_matrix, y)
+    rows = []
+    for (name, predicted, fit_seconds, predict_seconds, model_fit),\
+        model_statistics in zip(fitted, statistics):
+        if model_statistics is None:
+            model_statistics = [np.nan] * len(STATISTIC_NAMES)
+        rows.append(list(model_statistics) +\
+            [fit_seconds, predict_seconds, model_fit])
+    return(pd.DataFrame(rows, index = names,\
+        columns = STATISTIC_NAMES + ['fit_seconds', 'predict_seconds',\
+        'model']))
@@ -0,0 +1,134 @@
+# Parallel Cross-Validation of Alternative Classifiers (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # file paths for the shared arrays
+import time  # timing of model fits and predictions
+import shutil  # removal of the shared arrays directory
+import tempfile  # directory for the shared arrays
+import multiprocessing  # process pool for folds x models
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for the results table
+
+# import user-defined modules
+import compare_models
+import evaluate_classifier as eval
+import process_pool
+
+# fold number for each row, built once and used by every model
+# stratified folds keep the response proportions in each fold
+def fold_indices(y, n_folds = 5, stratified = True, random_state = 9999):
+    y = np.ravel(np.asarray(y))
+    rng = np.random.RandomState(random_state)
+    folds = np.empty(len(y), dtype = np.int32)
+    if stratified:
+        groups = [np.flatnonzero(y == value) for value in np.unique(y)]
+    else:
+        groups = [np.arange(len(y))]
+    offset = 0
+    for rows in groups:
+        rows = rows[rng.permutation(len(rows))]
+        # continue fold numbering across groups to balance fold sizes
+        folds[rows] = (offset + np.arange(len(rows))) % n_folds
+        offset = offset + len(rows)
+    return(folds)
+
+# arrays shared with worker processes as read-only memory maps
+# of files in a temporary directory... no copies of the data are
+# sent to the workers, only the file names
+_shared_x = None
+_shared_y = None
+_shared_folds = None
+
+def _set_shared_data(x, y, folds):
+    global _shared_x, _shared_y, _shared_folds
+    _shared_x = x
+    _shared_y = y
+    _shared_folds = folds
+
+def _open_shared_data(directory):
+    _set_shared_data(\
+        np.load(os.path.join(directory, 'x.npy'), mmap_mode = 'r'),\
+        np.load(os.path.join(directory, 'y.npy'), mmap_mode = 'r'),\
+        np.load(os.path.join(directory, 'folds.npy'), mmap_mode = 'r'))
+
+# fit one model with one fold held out and predict for that fold
+def fit_fold(fold, name, model):
+    test = (_shared_folds == fold)
+    start = time.time()
+    model_fit = model.fit(_shared_x[~test], _shared_y[~test])
+    fit_seconds = time.time() - start
+    start = time.time()
+    predicted = np.asarray(model_fit.predict(_shared_x[test]))
+    predict_seconds = time.time() - start
+    return(fold, name, predicted, fit_seconds, predict_seconds)
+
+def _fit_fold_task(task):
+    return(fit_fold(*task))
+
+# k-fold cross-validation of candidate models with all folds x models
+# fit concurrently in a process pool... the design matrix is written once
+# to a memory-mapped file shared by the workers. statistics from
+# evaluate_classifier are computed per fold for the held-out rows, with
+# the predictions of all models for a fold scored in one pass... n_jobs
+# defaults to one process (no pool) unless processes start by fork, and
+# in one process the arrays are used in memory, with no files written
+# returns a DataFrame indexed by model and fold
+def cross_validate(x, y, models = None, n_folds = 5, n_jobs = None,\
+    random_state = 9999):
+    x = np.ascontiguousarray(x, dtype = np.float64)
+    y = np.ravel(np.asarray(y))
+    if models is None:
+        models = compare_models.default_models()
+    folds = fold_indices(y, n_folds, random_state = random_state)
+    tasks = [(fold, name, model) for fold in range(n_folds)\
+        for name, model in models]
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs(len(tasks))
+    if n_jobs == 1:
+        # in this process the arrays are used directly, with no files
+        _set_shared_data(x, y, folds)
+        try:
+            fitted = [_fit_fold_task(task) for task in tasks]
+        finally:
+            _set_shared_data(None, None, None)
+    else:
+        directory = tempfile.mkdtemp(prefix = 'cross_validation_')
+        try:
+            np.save(os.path.join(directory, 'x.npy'), x)
+            np.save(os.path.join(directory, 'y.npy'), y)
+            np.save(os.path.join(directory, 'folds.npy'), folds)
+            pool = multiprocessing.Pool(processes = n_jobs,\
+                initializer = _open_shared_data, initargs = (directory,))
+            try:
+                fitted = pool.map(_fit_fold_task, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            shutil.rmtree(directory, ignore_errors = True)
+    rows = []
+    index = []
+    for fold in range(n_folds):
+        fold_results = [result for result in fitted if result[0] == fold]
+        statistics = eval.evaluate_classifiers(\
+            np.vstack([result[2] for result in fold_results]),\
+            y[folds == fold])
+        for (_, name, predicted, fit_seconds, predict_seconds),\
+            model_statistics in zip(fold_results, statistics):
+            if model_statistics is None:
+                model_statistics =\
+                    [np.nan] * len(compare_models.STATISTIC_NAMES)
+            rows.append(list(model_statistics) +\
+                [fit_seconds, predict_seconds])
+            index.append((name, fold))
+    return(pd.DataFrame(rows,\
+        index = pd.MultiIndex.from_tuples(index, names = ['model', 'fold']),\
+        columns = compare_models.STATISTIC_NAMES +\
+            ['fit_seconds', 'predict_seconds']))
+
+# mean of statistics across folds for each model
+def summarize_folds(fold_results):
+    return(fold_results.groupby(level = 'model', sort = False).mean())
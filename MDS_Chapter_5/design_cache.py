@@ -0,0 +1,137 @@
+# Compiled Design Matrices for Model Formulas (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import hashlib  # cache key from the data contents
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure and operations
+import patsy  # translate model specification into design matrices
+
+# initial number of rows allocated for a growing design matrix
+DEFAULT_CAPACITY = 1024
+
+# design matrices for a model formula compiled once
+# the formula is parsed and categorical levels are found only when the
+# design is compiled... the stored DesignInfo objects then encode new rows
+# directly (no re-parsing, no re-derivation of levels), and rows added
+# with append are written into preallocated arrays that grow by doubling
+# rows with missing data raise a patsy error rather than being dropped,
+# so encoded rows always line up with the rows of the data
+class CompiledDesign(object):
+
+    def __init__(self, formula, data, capacity = DEFAULT_CAPACITY):
+        self.formula = formula
+        if '~' in formula:
+            outcome, design = patsy.dmatrices(formula, data,\
+                NA_action = 'raise')
+            self.outcome_info = outcome.design_info
+        else:
+            outcome = None
+            design = patsy.dmatrix(formula, data, NA_action = 'raise')
+            self.outcome_info = None
+        self.design_info = design.design_info
+        self.column_names = list(self.design_info.column_names)
+        self.outcome_names = [] if outcome is None else\
+            list(self.outcome_info.column_names)
+        self.levels = categorical_levels(self.design_info)
+        self.n_rows = 0
+        self._design = np.empty((max(capacity, len(design)),\
+            len(self.column_names)))
+        self._outcome = np.empty((self._design.shape[0],\
+            len(self.outcome_names)))
+        self._store(np.asarray(outcome) if outcome is not None else None,\
+            np.asarray(design))
+
+    # encode rows of data with the compiled encoding
+    # returns outcome (None without an outcome) and design arrays
+    def transform(self, data, include_outcome = True):
+        if include_outcome and self.outcome_info is not None:
+            outcome, design = patsy.build_design_matrices(\
+                [self.outcome_info, self.design_info], data,\
+                NA_action = 'raise')
+            return(np.asarray(outcome), np.asarray(design))
+        design = patsy.build_design_matrices([self.design_info], data,\
+            NA_action = 'raise')[0]
+        return(None, np.asarray(design))
+
+    # encode only the new rows of a growing data set and add them
+    def append(self, new_data):
+        outcome, design = self.transform(new_data)
+        self._store(outcome, design)
+        return(self)
+
+    def _store(self, outcome, design):
+        n_new = design.shape[0]
+        if self.n_rows + n_new > self._design.shape[0]:
+            capacity = max(2 * self._design.shape[0], self.n_rows + n_new)
+            self._design = _grow(self._design, capacity)
+            self._outcome = _grow(self._outcome, capacity)
+        self._design[self.n_rows:self.n_rows + n_new] = design
+        if outcome is not None:
+            self._outcome[self.n_rows:self.n_rows + n_new] = outcome
+        self.n_rows = self.n_rows + n_new
+
+    # views (no copies) of the rows encoded so far
+    def design(self):
+        return(self._design[:self.n_rows])
+
+    def outcome(self):
+        return(self._outcome[:self.n_rows])
+
+    # outcome and design as DataFrames with patsy column names
+    # (as from patsy.dmatrices with return_type = 'dataframe')
+    def matrices(self, index = None):
+        outcome = pd.DataFrame(self.outcome(), columns = self.outcome_names,\
+            index = index)
+        design = pd.DataFrame(self.design(), columns = self.column_names,\
+            index = index)
+        return(outcome, design)
+
+def _grow(values, capacity):
+    grown = np.empty((capacity, values.shape[1]))
+    grown[:values.shape[0]] = values
+    return(grown)
+
+# categorical levels of each factor in a compiled design
+def categorical_levels(design_info):
+    return(dict((factor.name(), list(info.categories))\
+        for factor, info in design_info.factor_infos.items()\
+        if info.type == 'categorical'))
+
+# hash of a data set's column names, index, and values
+def data_hash(data):
+    data = pd.DataFrame(data)
+    digest = hashlib.sha1(str(list(data.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index = True).\
+        values.tobytes())
+    return(digest.hexdigest())
+
+# designs compiled in this session keyed by formula and data hash,
+# with the data hash of the latest design compiled for each formula
+_compiled_designs = {}
+_latest_data = {}
+
+# compile a formula for a data set on first use and reuse the encoding
+# afterwards... new data (a nightly refit, say) compile a new design,
+# and data = None returns the latest design compiled for the formula
+# returns None (after printing the error) when the data cannot be
+# encoded, for example when rows have missing data
+def compiled_design(formula, data = None):
+    if data is None:
+        if formula not in _latest_data:
+            print('\ncompiled_design error: no data given for a formula',\
+                'not compiled before\n')
+            return(None)
+        key = (formula, _latest_data[formula])
+    else:
+        key = (formula, data_hash(data))
+    if key not in _compiled_designs:
+        try:
+            _compiled_designs[key] = CompiledDesign(formula, data)
+        except patsy.PatsyError as error:
+            print('\ncompiled_design error:', error, '\n')
+            return(None)
+    _latest_data[formula] = key[1]
+    return(_compiled_designs[key])
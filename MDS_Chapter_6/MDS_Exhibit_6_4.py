@@ -13,7 +13,9 @@ from sklearn.metrics import euclidean_distances
 from sklearn.metrics.pairwise import linear_kernel as cosine_distances
 from sklearn.metrics.pairwise import manhattan_distances as manhattan_distances
 
-from sklearn import manifold  # multidimensional scaling
+
+# import user-defined module
+import positioning
 
 # These are the original data from a chart of U.S. airline miles.
 # Atla Chic  Den Hous   LA Miam   NY SanF Seat WaDC
@@ -47,10 +49,9 @@ print(distance_matrix)
 print(type(distance_matrix))
 
 # apply the multidimensional scaling algorithm and plot the map
-mds_method = manifold.MDS(n_components = 2, random_state = 9999,\
-    dissimilarity = 'precomputed')
-mds_fit = mds_method.fit(distance_matrix)  
-mds_coordinates = mds_method.fit_transform(distance_matrix) 
+# the map is fit once by SMACOF warm-started from classical scaling
+mds_coordinates = positioning.position_products(distance_matrix,\
+    n_components = 2, method = 'smacof', random_state = 9999)
                                                                                                                                   
 city_label = ['Atlanta', 'Chicago', 'Denver', 'Houston', 'Los Angeles',
     'Miami', 'New York', 'San Francisco', 'Seattle', 'Washington D.C.']
@@ -11,14 +11,12 @@ import pandas as pd
 # alternative distance metrics for multidimensional scaling
 from sklearn.metrics import euclidean_distances 
 from sklearn.metrics.pairwise import linear_kernel as cosine_distances
-from sklearn.metrics.pairwise import manhattan_distances as manhattan_distances
 
-from sklearn import manifold  # multidimensional scaling
 
-# read data from comma-delimited text file... create DataFrame object
-wisconsin_dells_data_frame = pd.read_csv('wisconsin_dells.csv')
-print(wisconsin_dells_data_frame.head)  # check the structure of the data frame
-print(wisconsin_dells_data_frame.shape)
+# import user-defined modules
+import binary_distances
+import recode
+import positioning
 
 binary_variable_names = ['shopping','antiquing',     
 'scenery','eatfine','eatcasual','eatfamstyle','eatfastfood','museums',       
@@ -28,35 +26,37 @@ binary_variable_names = ['shopping','antiquing',
 'outattract','nearbyattract','movietheater','concerttheater','barpubdance',
 'shopbroadway','bungeejumping']
 
-# let's focus on activities data
-dells_activities_data_frame_preliminary = \
-    pd.DataFrame(wisconsin_dells_data_frame, columns = binary_variable_names)
-
-# remove any records with missing data
-dells_activities_data_frame = dells_activities_data_frame_preliminary.dropna()
-print(dells_activities_data_frame.shape)
+# read data from comma-delimited text file... create DataFrame object
+wisconsin_dells_data_frame = pd.read_csv('wisconsin_dells.csv',\
+    dtype = dict((name, 'category') for name in binary_variable_names))
+print(wisconsin_dells_data_frame.head)  # check the structure of the data frame
+print(wisconsin_dells_data_frame.shape)
 
-# use dictionary object for mapping the response/target variable
-activity_to_binary = {'NO' : 0, 'YES' : 1, '': 0}
-for iname in binary_variable_names:
-    dells_activities_data_frame[iname] = \
-        dells_activities_data_frame[iname].map(activity_to_binary)
+# recode YES/NO activity responses into a uint8 matrix in one pass
+# using the categorical codes from parsing... remove any records
+# with missing data
+activities_matrix = recode.recode_frame(wisconsin_dells_data_frame,\
+    binary_variable_names, recode.YES_TO_BINARY)
+activities_matrix = recode.complete_cases(activities_matrix)
+print(activities_matrix.shape)
+dells_activities_data_frame = pd.DataFrame(activities_matrix,\
+    columns = binary_variable_names)
 print(dells_activities_data_frame[0:10])  # examine the first 10 rows of data    
  
-# convert DataFrame to numpy array representation of activities matrix                   
-activities_binary_matrix = dells_activities_data_frame.as_matrix().transpose() 
+# activities matrix (activities x respondents) as a view of the codes
+activities_binary_matrix = activities_matrix.T
 print(type(activities_binary_matrix))
 print(activities_binary_matrix.shape)
 
-# compute distance matrix
-distance_matrix = manhattan_distances(activities_binary_matrix)
+# compute distance matrix from bit-packed activity profiles
+distance_matrix = binary_distances.binary_distances(activities_binary_matrix,\
+    metric = 'manhattan')
 print(distance_matrix.shape)
 
 # apply the multidimensional scaling algorithm and plot the map
-mds_method = manifold.MDS(n_components = 2, random_state = 9999,\
-    dissimilarity = 'precomputed')
-mds_fit = mds_method.fit(distance_matrix)  
-mds_coordinates = mds_method.fit_transform(distance_matrix) 
+# the map is fit once by SMACOF warm-started from classical scaling
+mds_coordinates = positioning.position_products(distance_matrix,\
+    n_components = 2, method = 'smacof', random_state = 9999)
                                                                                                                                   
 activity_names = ['Shopping', 'Antiquing',     
 'Site Seeing', 'Fine Dining', 'Casual Dining', 
@@ -7,17 +7,17 @@ from __future__ import division, print_function
 import numpy as np  # arrays and numerical processing
 import matplotlib.pyplot as plt  # 2D plotting
 import pandas as pd  # DataFrame work
-from scipy.cluster.hierarchy import ward, dendrogram  # clustering
 
 # alternative distance metrics for multidimensional scaling
 from sklearn.metrics import euclidean_distances 
 from sklearn.metrics.pairwise import linear_kernel as cosine_distances
-from sklearn.metrics.pairwise import manhattan_distances as manhattan_distances
+from scipy.spatial.distance import squareform  # condensed to square
+from scipy.cluster.hierarchy import linkage
 
-# read data from comma-delimited text file... create DataFrame object
-wisconsin_dells_data_frame = pd.read_csv('wisconsin_dells.csv')
-print(wisconsin_dells_data_frame.head)  # check the structure of the data frame
-print(wisconsin_dells_data_frame.shape)
+# import user-defined modules
+import binary_distances
+import recode
+import hierarchical_clusters
 
 binary_variable_names = ['shopping','antiquing',     
 'scenery','eatfine','eatcasual','eatfamstyle','eatfastfood','museums',       
@@ -27,29 +27,38 @@ binary_variable_names = ['shopping','antiquing',
 'outattract','nearbyattract','movietheater','concerttheater','barpubdance',
 'shopbroadway','bungeejumping']
 
-# let's focus on activities data
-dells_activities_data_frame_preliminary = \
-    pd.DataFrame(wisconsin_dells_data_frame, columns = binary_variable_names)
-
-# remove any records with missing data
-dells_activities_data_frame = dells_activities_data_frame_preliminary.dropna()
-print(dells_activities_data_frame.shape)
+# read data from comma-delimited text file... create DataFrame object
+wisconsin_dells_data_frame = pd.read_csv('wisconsin_dells.csv',\
+    dtype = dict((name, 'category') for name in binary_variable_names))
+print(wisconsin_dells_data_frame.head)  # check the structure of the data frame
+print(wisconsin_dells_data_frame.shape)
 
-# use dictionary object for mapping the response/target variable
-activity_to_binary = {'NO' : 0, 'YES' : 1, '': 0}
-for iname in binary_variable_names:
-    dells_activities_data_frame[iname] = \
-        dells_activities_data_frame[iname].map(activity_to_binary)
+# recode YES/NO activity responses into a uint8 matrix in one pass
+# using the categorical codes from parsing... remove any records
+# with missing data
+activities_matrix = recode.recode_frame(wisconsin_dells_data_frame,\
+    binary_variable_names, recode.YES_TO_BINARY)
+activities_matrix = recode.complete_cases(activities_matrix)
+print(activities_matrix.shape)
+dells_activities_data_frame = pd.DataFrame(activities_matrix,\
+    columns = binary_variable_names)
 print(dells_activities_data_frame[0:10])  # examine the first 10 rows of data    
  
-# convert DataFrame to numpy array representation of activities matrix                   
-activities_binary_matrix = dells_activities_data_frame.as_matrix().transpose() 
+# activities matrix (activities x respondents) as a view of the codes
+activities_binary_matrix = activities_matrix.T
 print(type(activities_binary_matrix))
 print(activities_binary_matrix.shape)
 
-# compute distance matrix
-distance_matrix = manhattan_distances(activities_binary_matrix)
-print(distance_matrix.shape)
+# distances between the bit-packed activity profiles are kept in
+# condensed form (one entry per pair of activities)... for 0/1 profiles
+# euclidean distances are the square roots of manhattan distances (the
+# number of respondents who did one activity but not the other)
+activities_packed, n_respondents =\
+    binary_distances.pack_rows(activities_binary_matrix)
+condensed_distances = hierarchical_clusters.condensed_distances(\
+    activities_packed, n_respondents, metric = 'euclidean')
+print(condensed_distances.shape)
+print(squareform(condensed_distances)[:5, :5])
                                                  
 activity_names = ['Shopping', 'Antiquing',     
 'Site Seeing', 'Fine Dining', 'Casual Dining', 
@@ -63,9 +72,11 @@ activity_names = ['Shopping', 'Antiquing',
 'Movie Theater', 'Concert Theater', 'Bar/Pub Dancing',
 'Shop Broadway', 'Bungee Jumping']
 
-linkage_matrix = ward(distance_matrix) 
+# ward linkage from the condensed euclidean distances computed above
+linkage_matrix = linkage(condensed_distances, method = 'ward')
 fig, ax = plt.subplots(figsize=(15, 20)) # set size
-ax = dendrogram(linkage_matrix, orientation="right", labels=activity_names)
+ax = hierarchical_clusters.plot_dendrogram(linkage_matrix,\
+    labels = activity_names, ax = ax, orientation = 'right')
 
 plt.tick_params(\
     axis = 'x',          # changes apply to the x-axis
@@ -0,0 +1,96 @@
+# Distances Between Bit-Packed Binary Profiles (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# number of rows of the first matrix compared at a time
+DEFAULT_BLOCK_SIZE = 256
+
+# approximate number of words held in intermediate arrays at a time
+DEFAULT_MAX_ELEMENTS = 1 << 22
+
+# number of one bits in each byte value, for numpy without bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)],\
+    dtype = np.uint8)
+
+# number of one bits per 64-bit word
+def popcount(words):
+    words = np.asarray(words, dtype = np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return(np.bitwise_count(words))
+    counts = _BYTE_POPCOUNT[words.view(np.uint8)]
+    return(counts.reshape(words.shape + (8,)).sum(axis = -1))
+
+# pack each row of a 0/1 matrix into 64-bit words
+# (one bit per column instead of eight bytes for int64 values)
+# returns the packed rows and the number of bits (columns) per row
+def pack_rows(binary_matrix):
+    binary_matrix = np.asarray(binary_matrix)
+    n_rows, n_bits = binary_matrix.shape
+    packed = np.packbits(binary_matrix != 0, axis = 1)
+    n_words = -(-packed.shape[1] // 8)
+    padded = np.zeros((n_rows, 8 * n_words), dtype = np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return(padded.view(np.uint64), n_bits)
+
+# number of one bits in each packed row
+def row_counts(packed):
+    return(popcount(packed).sum(axis = 1, dtype = np.int64))
+
+# counts of columns where both rows have a one, for rows of packed_a
+# against rows of packed_b... computed in blocks of packed_a rows and of
+# words so that intermediate arrays stay near max_elements in size
+def both_counts(packed_a, packed_b, block_size = DEFAULT_BLOCK_SIZE,\
+    max_elements = DEFAULT_MAX_ELEMENTS):
+    counts = np.zeros((packed_a.shape[0], packed_b.shape[0]),\
+        dtype = np.int64)
+    n_words = packed_a.shape[1]
+    for begin in range(0, packed_a.shape[0], block_size):
+        block = packed_a[begin:begin + block_size]
+        word_block = max(1, max_elements // (block.shape[0] *\
+            max(packed_b.shape[0], 1)))
+        for word in range(0, n_words, word_block):
+            words = slice(word, word + word_block)
+            counts[begin:begin + block_size] +=\
+                popcount(block[:, np.newaxis, words] &\
+                packed_b[np.newaxis, :, words]).sum(axis = 2,\
+                dtype = np.int64)
+    return(counts)
+
+# distances between packed rows from bit counts
+#   manhattan/hamming: number of columns where the rows differ
+#   euclidean: square root of the number of columns where the rows differ
+#   matching: proportion of columns where the rows differ
+#   jaccard: 1 - (both one) / (either one), zero for two empty rows
+def packed_distances(packed_a, n_bits, packed_b = None,\
+    metric = 'manhattan', block_size = DEFAULT_BLOCK_SIZE):
+    if metric not in ('manhattan', 'hamming', 'euclidean', 'matching',\
+        'jaccard'):
+        print('\npacked_distances error: metric must be manhattan,',\
+            'hamming, euclidean, matching, or jaccard\n')
+        return(None)
+    if packed_b is None:
+        packed_b = packed_a
+    both = both_counts(packed_a, packed_b, block_size)
+    count_a = row_counts(packed_a)[:, np.newaxis]
+    count_b = row_counts(packed_b)[np.newaxis, :]
+    differ = count_a + count_b - 2 * both
+    if metric in ('manhattan', 'hamming'):
+        return(differ.astype(np.float64))
+    if metric == 'euclidean':
+        return(np.sqrt(differ.astype(np.float64)))
+    if metric == 'matching':
+        return(differ / n_bits)
+    if metric == 'jaccard':
+        either = (count_a + count_b - both).astype(np.float64)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            return(np.where(either > 0, differ / either, 0.0))
+
+# distances between rows of a 0/1 matrix (packs the rows first)
+def binary_distances(binary_matrix, metric = 'manhattan',\
+    block_size = DEFAULT_BLOCK_SIZE):
+    packed, n_bits = pack_rows(binary_matrix)
+    return(packed_distances(packed, n_bits, metric = metric,\
+        block_size = block_size))
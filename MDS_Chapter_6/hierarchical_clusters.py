@@ -0,0 +1,93 @@
+# Hierarchical Clustering from Bit-Packed Binary Profiles (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+from scipy.cluster.hierarchy import linkage, fcluster, dendrogram
+
+# import user-defined module
+import binary_distances
+
+# above this many items cluster_items clusters a sample of items and
+# assigns the remaining items to the cluster of their nearest sampled item
+DEFAULT_MAX_ITEMS = 5000
+
+# largest number of leaves drawn before the dendrogram is truncated
+DEFAULT_MAX_LEAVES = 50
+
+# condensed (upper-triangular) distances between packed rows, in the order
+# used by scipy.spatial.distance.pdist... each block of rows is compared
+# only with itself and the rows after it, so the square n x n matrix is
+# never formed
+def condensed_distances(packed, n_bits, metric = 'euclidean',\
+    block_size = binary_distances.DEFAULT_BLOCK_SIZE):
+    n = packed.shape[0]
+    condensed = np.empty(n * (n - 1) // 2, dtype = np.float64)
+    position = 0
+    for begin in range(0, n, block_size):
+        end = min(begin + block_size, n)
+        block = binary_distances.packed_distances(packed[begin:end], n_bits,\
+            packed[begin:], metric = metric, block_size = block_size)
+        if block is None:
+            return(None)
+        for row in range(end - begin):
+            values = block[row, row + 1:]
+            condensed[position:position + len(values)] = values
+            position = position + len(values)
+    return(condensed)
+
+# cluster of the nearest sampled item for every packed row
+def nearest_sample_labels(packed, n_bits, sample, sample_labels,\
+    metric = 'euclidean', block_size = binary_distances.DEFAULT_BLOCK_SIZE):
+    labels = np.empty(packed.shape[0], dtype = sample_labels.dtype)
+    sample_packed = packed[sample]
+    for begin in range(0, packed.shape[0], block_size):
+        end = min(begin + block_size, packed.shape[0])
+        distances = binary_distances.packed_distances(packed[begin:end],\
+            n_bits, sample_packed, metric = metric, block_size = block_size)
+        labels[begin:end] = sample_labels[np.argmin(distances, axis = 1)]
+    labels[sample] = sample_labels
+    return(labels)
+
+# hierarchical clustering of the rows of a 0/1 matrix
+# with no more than max_items rows the linkage is computed exactly from
+# condensed distances of all packed rows... with more rows a random
+# sample of max_items rows is clustered, and every other row is assigned
+# to the cluster of its nearest sampled row. the tree is cut into
+# n_clusters either way, and the return is (linkage_matrix of the
+# clustered rows, indices of those rows, cluster labels for all rows),
+# the indices being all rows in order for the exact linkage
+# ward linkage needs euclidean distances, which for 0/1 rows are the
+# square roots of manhattan distances
+def cluster_items(binary_matrix, method = 'ward', metric = 'euclidean',\
+    max_items = DEFAULT_MAX_ITEMS, n_clusters = 10, random_state = 9999):
+    packed, n_bits = binary_distances.pack_rows(binary_matrix)
+    n = packed.shape[0]
+    if n <= max_items:
+        linkage_matrix = linkage(condensed_distances(packed, n_bits,\
+            metric), method = method)
+        return(linkage_matrix, np.arange(n), fcluster(linkage_matrix,\
+            n_clusters, criterion = 'maxclust'))
+    rng = np.random.RandomState(random_state)
+    sample = np.sort(rng.choice(n, size = max_items, replace = False))
+    linkage_matrix = linkage(condensed_distances(packed[sample], n_bits,\
+        metric), method = method)
+    sample_labels = fcluster(linkage_matrix, n_clusters,\
+        criterion = 'maxclust')
+    labels = nearest_sample_labels(packed, n_bits, sample, sample_labels,\
+        metric)
+    return(linkage_matrix, sample, labels)
+
+# dendrogram drawn from a truncated linkage... with more than max_leaves
+# items only the last max_leaves merged clusters are drawn, labeled by
+# their item counts, so plotting time does not grow with the number of items
+def plot_dendrogram(linkage_matrix, labels = None, ax = None,\
+    max_leaves = DEFAULT_MAX_LEAVES, orientation = 'right'):
+    n_leaves = linkage_matrix.shape[0] + 1
+    if n_leaves <= max_leaves:
+        return(dendrogram(linkage_matrix, orientation = orientation,\
+            labels = labels, ax = ax))
+    return(dendrogram(linkage_matrix, orientation = orientation,\
+        truncate_mode = 'lastp', p = max_leaves, show_contracted = True,\
+        ax = ax))
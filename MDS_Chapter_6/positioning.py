@@ -0,0 +1,87 @@
+# Multidimensional Scaling for Product Positioning Maps (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+from scipy.sparse.linalg import LinearOperator, eigsh  # truncated eigensolver
+from sklearn.manifold import smacof  # metric/nonmetric scaling by SMACOF
+
+# above this many items classical scaling uses the truncated eigensolver
+# rather than a full eigendecomposition of the centered matrix
+DENSE_EIGEN_LIMIT = 500
+
+# top eigenvalues and eigenvectors of the double-centered matrix
+# B = -1/2 J D**2 J without forming B... J v is v minus its mean
+def _top_eigen(squared, n_components):
+    n = squared.shape[0]
+    if n <= DENSE_EIGEN_LIMIT:
+        centered = squared - squared.mean(axis = 0)
+        centered = centered - centered.mean(axis = 1)[:, np.newaxis]
+        values, vectors = np.linalg.eigh(-0.5 * centered)
+        order = np.argsort(values)[::-1][:n_components]
+        return(values[order], vectors[:, order])
+    def matvec(v):
+        v = np.ravel(v)
+        w = np.dot(squared, v - v.mean())
+        return(-0.5 * (w - w.mean()))
+    operator = LinearOperator((n, n), matvec = matvec, dtype = np.float64)
+    values, vectors = eigsh(operator, k = n_components, which = 'LA')
+    order = np.argsort(values)[::-1]
+    return(values[order], vectors[:, order])
+
+# classical (Torgerson) scaling of a square dissimilarity matrix
+# coordinates are eigenvectors scaled by square roots of eigenvalues,
+# with negative eigenvalues (non-Euclidean dissimilarities) set to zero
+def classical_mds(dissimilarities, n_components = 2):
+    dissimilarities = np.asarray(dissimilarities, dtype = np.float64)
+    values, vectors = _top_eigen(dissimilarities ** 2, n_components)
+    return(vectors * np.sqrt(np.maximum(values, 0)))
+
+# landmarks chosen one at a time as the item farthest from those chosen
+# so far (max-min)... distance_function(i) returns distances from item i
+# to all n items, so only n_landmarks rows of distances are computed
+# returns landmark indices and the n_landmarks x n distance matrix
+def maxmin_landmarks(distance_function, n, n_landmarks = 100,\
+    random_state = 9999):
+    rng = np.random.RandomState(random_state)
+    landmarks = [rng.randint(n)]
+    distances = [np.asarray(distance_function(landmarks[0]),\
+        dtype = np.float64)]
+    nearest = distances[0].copy()
+    while len(landmarks) < min(n_landmarks, n):
+        landmarks.append(int(np.argmax(nearest)))
+        distances.append(np.asarray(distance_function(landmarks[-1]),\
+            dtype = np.float64))
+        nearest = np.minimum(nearest, distances[-1])
+    return(np.array(landmarks), np.vstack(distances))
+
+# landmark scaling (de Silva and Tenenbaum) for large catalogs
+# classical scaling of the landmarks alone, then every item is placed by
+# triangulation from its squared distances to the landmarks...
+# memory and time are linear in the number of items
+def landmark_mds(landmark_distances, landmarks, n_components = 2):
+    squared = np.asarray(landmark_distances, dtype = np.float64) ** 2
+    landmark_squared = squared[:, landmarks]
+    values, vectors = _top_eigen(landmark_squared, n_components)
+    values = np.maximum(values, np.finfo(np.float64).eps)
+    # pseudo-inverse transpose of landmark coordinates
+    pseudo_inverse = vectors / np.sqrt(values)
+    mean_squared = landmark_squared.mean(axis = 1)
+    return(-0.5 * np.dot((squared - mean_squared[:, np.newaxis]).T,\
+        pseudo_inverse))
+
+# positioning map fit once from a square dissimilarity matrix
+# method 'classical' for Torgerson scaling alone, or 'smacof' for
+# stress majorization warm-started from the classical solution
+# (a single SMACOF run rather than several random starts)
+def position_products(dissimilarities, n_components = 2,\
+    method = 'smacof', metric = True, max_iter = 300, random_state = 9999):
+    dissimilarities = np.asarray(dissimilarities, dtype = np.float64)
+    coordinates = classical_mds(dissimilarities, n_components)
+    if method == 'classical':
+        return(coordinates)
+    coordinates, stress = smacof(dissimilarities, metric = metric,\
+        n_components = n_components, init = coordinates, n_init = 1,\
+        max_iter = max_iter, random_state = random_state)
+    return(coordinates)
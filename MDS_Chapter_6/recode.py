@@ -0,0 +1,70 @@
+# Recoding Categorical Survey Columns to Binary Codes (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure and operations
+
+# code for missing data and for values not in a mapping
+MISSING = 255
+
+# mapping for YES/NO survey responses
+YES_TO_BINARY = {'NO' : 0, 'YES' : 1}
+
+# lookup array for the categories of a column... the extra last entry
+# is picked up by categorical code -1 (missing data)
+def lookup_table(categories, mapping, fill = MISSING):
+    return(np.array([mapping.get(category, fill) for category in categories]\
+        + [fill], dtype = np.uint8))
+
+# recode columns of a DataFrame into one uint8 matrix in a single pass
+# specs is a list of (column name, mapping) pairs, one per output column,
+# so the same source column may be recoded more than one way... each
+# source column is converted to categorical codes once and each output
+# column is one take through a lookup array. the matrix is column-major,
+# so matrix[:, j] is a contiguous (zero-copy) view of the j-th column
+# and matrix.T is a row-major items x observations matrix
+def recode_columns(data_frame, specs, fill = MISSING):
+    matrix = np.empty((len(data_frame), len(specs)), dtype = np.uint8,\
+        order = 'F')
+    categorical = {}
+    for j, (name, mapping) in enumerate(specs):
+        if name not in categorical:
+            values = data_frame[name]
+            if values.dtype.name != 'category':
+                values = values.astype('category')
+            categorical[name] = values
+        values = categorical[name]
+        lookup = lookup_table(values.cat.categories, mapping, fill)
+        np.take(lookup, values.cat.codes.values, out = matrix[:, j])
+    return(matrix)
+
+# recode many columns that share one mapping
+def recode_frame(data_frame, columns, mapping, fill = MISSING):
+    return(recode_columns(data_frame, [(name, mapping) for name in columns],\
+        fill))
+
+# rows with no missing codes
+def complete_rows(matrix, missing = MISSING):
+    return(~(matrix == missing).any(axis = 1))
+
+# matrix of complete rows only (column-major, copied only when
+# there are rows to drop)
+def complete_cases(matrix, missing = MISSING):
+    complete = complete_rows(matrix, missing)
+    if complete.all():
+        return(matrix)
+    return(np.asfortranarray(matrix[complete]))
+
+# read columns of a comma-delimited file directly as categorical codes
+# (the parser stores each distinct string once) and recode them with one
+# mapping... rows with missing data are dropped unless drop_missing is
+# False, in which case they carry the MISSING code
+def read_recoded(file_name, columns, mapping, drop_missing = True):
+    data_frame = pd.read_csv(file_name, usecols = columns,\
+        dtype = 'category')
+    matrix = recode_frame(data_frame, columns, mapping)
+    if drop_missing:
+        return(complete_cases(matrix))
+    return(matrix)
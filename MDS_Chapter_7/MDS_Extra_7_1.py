@@ -5,10 +5,12 @@ from __future__ import division, print_function
 from future_builtins import ascii, filter, hex, map, oct, zip
 
 # import packages into the namespace for this program
-import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 
+# import user-defined module
+import factorial_design
+
 # first import data from the comma-delimited file soaps.csv
 # of individual observations (households) in the field test
 # the response variable relates to brand choice
@@ -29,48 +31,22 @@ print(soaps.tail())
 # -------------------------
 # Define the Design Matrix
 # -------------------------
-Intercept = np.array([1] * len(soaps))
-
-# use dictionary objects for mapping to 0/1 binary codes
-muser_to_binary = {'NO' : 0, 'YES' : 1}
-YESmuser = np.array(soaps['muser'].map(muser_to_binary))
-
-wtemp_to_binary = {'LOW' : 0, 'HIGH' : 1}
-HIGHwtemp = np.array(soaps['wtemp'].map(wtemp_to_binary))
-
-medium_wtype_to_binary = {'SOFT' : 0, 'MEDIUM' : 1, 'HARD': 0}
-MEDIUMwtype = np.array(soaps['wtype'].map(medium_wtype_to_binary))
-
-hard_wtype_to_binary = {'SOFT' : 0, 'MEDIUM' : 0, 'HARD': 1}
-HARDwtype = np.array(soaps['wtype'].map(hard_wtype_to_binary))
-
-# define two-way interation terms
-YESmuser_HIGHwtemp = YESmuser * HIGHwtemp
-YESmuser_MEDIUMwtype = YESmuser * MEDIUMwtype
-YESmuser_HARDwtype = YESmuser * HARDwtype
-HIGHwtemp_MEDIUMwtype = HIGHwtemp * MEDIUMwtype
-HIGHwtemp_HARDwtype = HIGHwtemp * HARDwtype
-
-# define three-way interation terms
-YESmuser_HIGHwtemp_MEDIUMwtype = YESmuser * HIGHwtemp * MEDIUMwtype
-YESmuser_HIGHwtemp_HARDwtype = YESmuser * HIGHwtemp * HARDwtype
-
-# specify complete experimental design with interactions
-Design_Matrix = np.array([Intercept,\
-    YESmuser,\
-    HIGHwtemp,\
-    MEDIUMwtype,\
-    HARDwtype,\
-    YESmuser_HIGHwtemp,\
-    YESmuser_MEDIUMwtype,\
-    YESmuser_HARDwtype,\
-    HIGHwtemp_MEDIUMwtype,\
-    HIGHwtemp_HARDwtype,\
-    YESmuser_HIGHwtemp_MEDIUMwtype,\
-    YESmuser_HIGHwtemp_HARDwtype]).T
-
-# define the binary response variable
-Response = np.array(soaps['response'])
+# experimental factors with reference levels first
+soap_factors = [('muser', ['NO', 'YES']),\
+    ('wtemp', ['LOW', 'HIGH']),\
+    ('wtype', ['SOFT', 'MEDIUM', 'HARD'])]
+
+# complete experimental design with two-way and three-way interactions
+# households are collapsed into one binomial row per cell of the
+# 2 x 2 x 3 design, with the binary response variable counted as
+# [successes, failures] for each cell
+Response, Design_Matrix, design_names, cell_codes =\
+    factorial_design.grouped_binomial(soaps, soap_factors,\
+    soaps['response'], order = 3)
+# term names as columns so the model summary labels each coefficient
+Design_Matrix = pd.DataFrame(Design_Matrix, columns = design_names)
+print(design_names)
+print(Response)
 
 # -------------------------
 # Fit Model to Data
@@ -11,9 +11,12 @@ from pandas.tools.rplot import RPlot, TrellisGrid, GeomPoint,\
 import numpy as np  # arrays and math functions
 from scipy.stats import uniform  # for training-and-test split
 import statsmodels.api as sm  # statistical models (including regression)
-import statsmodels.formula.api as smf  # R-like model specification
 import matplotlib.pyplot as plt  # 2D plotting
 
+# import user-defined modules
+import design_cache
+import streaming_ols
+
 # read in Dodgers bobbleheads data and create data frame
 dodgers = pd.read_csv("dodgers.csv")
 
@@ -132,15 +135,22 @@ print(dodgers_test.head())
 # specify a simple model with bobblehead entered last
 my_model = str('attend ~ ordered_month + ordered_day_of_week + bobblehead')
 
+# compile the model formula once on the full data set so that all
+# months and days of the week are levels of the encoding... training,
+# test, and full-data design matrices are rows of the same encoding
+dodgers_design = design_cache.compiled_design(my_model, dodgers)
+attend, design = dodgers_design.matrices(index = dodgers.index)
+train_rows = (dodgers['runiform'] >= 0.33).values
+
 # fit the model to the training set
-train_model_fit = smf.ols(my_model, data = dodgers_train).fit()
+train_model_fit = sm.OLS(attend[train_rows], design[train_rows]).fit()
 # summary of model fit to the training set
 print(train_model_fit.summary())
 # training set predictions from the model fit to the training set
 dodgers_train['predict_attend'] = train_model_fit.fittedvalues
 
 # test set predictions from the model fit to the training set
-dodgers_test['predict_attend'] = train_model_fit.predict(dodgers_test)
+dodgers_test['predict_attend'] = train_model_fit.predict(design[~train_rows])
 
 # compute the proportion of response variance
 # accounted for when predicting out-of-sample
@@ -148,12 +158,20 @@ print('\nProportion of Test Set Variance Accounted for: ',\
     round(np.power(dodgers_test['attend'].corr(dodgers_test['predict_attend']),2),3))
 
 # use the full data set to obtain an estimate of the increase in
-# attendance due to bobbleheads, controlling for other factors 
-my_model_fit = smf.ols(my_model, data = dodgers).fit()
-print(my_model_fit.summary())
+# attendance due to bobbleheads, controlling for other factors
+# rather than refitting, the training-set estimator absorbs the test
+# games one at a time (as it would each new game), each update O(p**2)
+my_model_fit = streaming_ols.StreamingOLS(dodgers_design.column_names)
+my_model_fit.add(design[train_rows].values, attend[train_rows].values)
+for game in np.flatnonzero(~train_rows):
+    my_model_fit.add(design.values[game], attend.values[game])
+print('\nFull data set coefficients:')
+print(my_model_fit.coefficient_table())
 
 print('\nEstimated Effect of Bobblehead Promotion on Attendance: ',\
-    round(my_model_fit.params[13],0))
+    round(my_model_fit.coefficient('bobblehead[T.YES]'),0),\
+    ' Standard Error: ',\
+    round(my_model_fit.standard_errors()['bobblehead[T.YES]'],0))
     
 # Suggestions for the student: Reproduce the figures in this chapter
 # using matplotlib, ggplot, and/or rpy2 calls to R graphics. 
@@ -0,0 +1,164 @@
+# Streaming Least-Squares Regression with Cholesky Updates (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # Series of coefficients by name
+from scipy.linalg import solve_triangular  # back substitution
+from scipy.stats import t as t_distribution  # p-values for coefficients
+
+# ordinary least squares updated one observation at a time
+# the estimator keeps the upper-triangular Cholesky factor R of X'X
+# (X'X = R'R), X'y, y'y, and the number of observations... adding a row
+# is a rank-one update of R by Givens rotations and removing a row is a
+# rank-one downdate by hyperbolic rotations, each O(p**2) for p columns,
+# and coefficients are two triangular solves, also O(p**2), so they are
+# available at any time without refitting
+class StreamingOLS(object):
+
+    def __init__(self, column_names):
+        self.column_names = list(column_names)
+        p = len(self.column_names)
+        self.factor = np.zeros((p, p))
+        self.xty = np.zeros(p)
+        self.yty = 0.0
+        self.n_obs = 0
+
+    # add observations: design rows (one row or a 2D array) and outcomes
+    def add(self, design, outcome):
+        design, outcome = _rows(design, outcome)
+        for x, y in zip(design, outcome):
+            _cholesky_update(self.factor, x)
+            self.xty += y * x
+            self.yty += y * y
+            self.n_obs += 1
+        return(self)
+
+    # remove observations added earlier, as when a rolling window of
+    # games moves forward... returns None if removing a row would leave
+    # X'X singular (that row and those after it are not removed)
+    def remove(self, design, outcome):
+        design, outcome = _rows(design, outcome)
+        for x, y in zip(design, outcome):
+            factor = self.factor.copy()
+            if not _cholesky_downdate(factor, x):
+                print('\nStreamingOLS.remove error: removing the row',\
+                    'leaves X\'X singular\n')
+                return(None)
+            self.factor = factor
+            self.xty -= y * x
+            self.yty -= y * y
+            self.n_obs -= 1
+        return(self)
+
+    def _solved(self):
+        diagonal = np.abs(np.diag(self.factor))
+        if self.n_obs < len(self.column_names) or\
+            diagonal.min() <= 1.0e-10 * max(diagonal.max(), 1.0):
+            print('\nStreamingOLS error: X\'X is singular for the',\
+                'observations so far\n')
+            return(None)
+        z = solve_triangular(self.factor, self.xty, trans = 'T')
+        return(solve_triangular(self.factor, z))
+
+    # coefficients as a Series indexed by column name (as params from
+    # a statsmodels fit), or None while X'X is singular
+    def coefficients(self):
+        solution = self._solved()
+        if solution is None:
+            return(None)
+        return(pd.Series(solution, index = self.column_names))
+
+    # one coefficient by column name, such as 'bobblehead[T.YES]'
+    def coefficient(self, name):
+        coefficients = self.coefficients()
+        if coefficients is None:
+            return(None)
+        return(coefficients[name])
+
+    # residual sum of squares y'y - b'X'y
+    def residual_sum_of_squares(self):
+        solution = self._solved()
+        if solution is None:
+            return(None)
+        return(self.yty - np.dot(solution, self.xty))
+
+    # standard errors of the coefficients: the square roots of the
+    # diagonal of s**2 (X'X)^-1, with s**2 the residual sum of squares
+    # over n - p... (X'X)^-1 = R^-1 R^-T, so its diagonal holds the
+    # squared row norms of R^-1, one triangular inversion
+    def standard_errors(self):
+        residual_sum_of_squares = self.residual_sum_of_squares()
+        if residual_sum_of_squares is None:
+            return(None)
+        degrees_of_freedom = self.n_obs - len(self.column_names)
+        if degrees_of_freedom <= 0:
+            print('\nStreamingOLS error: no residual degrees of freedom\n')
+            return(None)
+        inverse = solve_triangular(self.factor,\
+            np.eye(len(self.column_names)))
+        variance = max(residual_sum_of_squares, 0) / degrees_of_freedom
+        return(pd.Series(np.sqrt(variance * (inverse ** 2).sum(axis = 1)),\
+            index = self.column_names))
+
+    # coefficients with standard errors, t statistics, and two-sided
+    # p-values, as in the coefficient table of a statsmodels summary
+    def coefficient_table(self):
+        standard_errors = self.standard_errors()
+        if standard_errors is None:
+            return(None)
+        coefficients = self.coefficients()
+        t_values = coefficients / standard_errors
+        p_values = 2 * t_distribution.sf(np.abs(t_values),\
+            self.n_obs - len(self.column_names))
+        return(pd.DataFrame({'coef': coefficients,\
+            'std_err': standard_errors, 't': t_values,\
+            'p_value': p_values}, columns = ['coef', 'std_err', 't',\
+            'p_value']))
+
+    def predict(self, design):
+        coefficients = self.coefficients()
+        if coefficients is None:
+            return(None)
+        return(np.dot(np.atleast_2d(np.asarray(design, dtype = np.float64)),\
+            coefficients.values))
+
+def _rows(design, outcome):
+    design = np.atleast_2d(np.asarray(design, dtype = np.float64))
+    outcome = np.atleast_1d(np.asarray(outcome, dtype = np.float64)).ravel()
+    return(design, outcome)
+
+# rank-one update of an upper-triangular factor in place: R'R + xx'
+# Givens rotations zero x into R one column at a time (rows of R that
+# are still zero, before X'X has full rank, take x directly)
+def _cholesky_update(factor, x):
+    x = x.copy()
+    for k in range(len(x)):
+        if x[k] == 0:
+            continue
+        r = np.hypot(factor[k, k], x[k])
+        c = factor[k, k] / r
+        s = x[k] / r
+        row = factor[k, k:].copy()
+        factor[k, k:] = c * row + s * x[k:]
+        x[k:] = c * x[k:] - s * row
+
+# rank-one downdate of an upper-triangular factor in place: R'R - xx'
+# by hyperbolic rotations... returns False if the result would not be
+# positive definite (the factor is then partly modified)
+def _cholesky_downdate(factor, x):
+    x = x.copy()
+    for k in range(len(x)):
+        if x[k] == 0:
+            continue
+        difference = factor[k, k] ** 2 - x[k] ** 2
+        if difference <= 1.0e-12 * factor[k, k] ** 2:
+            return(False)
+        r = np.sqrt(difference)
+        c = r / factor[k, k]
+        s = x[k] / factor[k, k]
+        factor[k, k] = r
+        factor[k, (k + 1):] = (factor[k, (k + 1):] - s * x[(k + 1):]) / c
+        x[(k + 1):] = c * x[(k + 1):] - s * factor[k, (k + 1):]
+    return(True)
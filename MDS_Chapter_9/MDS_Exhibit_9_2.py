@@ -1,90 +1,196 @@
 # Association Rules for Market Basket Analysis (Python)
 
-# import package for analysis and modeling
-from rpy2.robjects import r   # interface from Python to R
-
-r('library(arules)')  # association rules
-r('library(arulesViz)')  # data visualization of association rules
-r('library(RColorBrewer)')  # color palettes for plots
-
-r('data(Groceries)')  # grocery transactions object from arules package
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # operating system interface for file paths
+
+# import packages for analysis and modeling
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure and operations
+import matplotlib.pyplot as plt  # 2D plotting
+from scipy.cluster.vq import kmeans2  # grouping of rule antecedents
+
+# import user-defined modules
+import market_basket
+import rule_store
+import item_taxonomy
+
+# the Groceries transactions from the arules package, exported once
+# from R as a basket file with one market basket per line and as a
+# table of item labels with their level1 and level2 categories:
+#   library(arules); data(Groceries)
+#   write(Groceries, file = "groceries.csv", format = "basket", sep = ",")
+#   write.csv(itemInfo(Groceries), file = "groceries_item_info.csv",
+#       row.names = FALSE)
+# when the files are not here, they are exported through rpy2 and R
+if not (os.path.exists('groceries.csv') and\
+    os.path.exists('groceries_item_info.csv')):
+    market_basket.export_arules_data('groceries.csv',\
+        'groceries_item_info.csv')
+Groceries = market_basket.read_baskets('groceries.csv')
+item_info = pd.read_csv('groceries_item_info.csv')
+
+# item hierarchy (labels, level2, level1) over the one base matrix
+taxonomy = item_taxonomy.ItemTaxonomy(Groceries, item_info)
 
 # show the dimensions of the transactions object
-r('print(dim(Groceries))')
-
-r('print(dim(Groceries)[1])')  # 9835 market baskets for shopping trips
-r('print(dim(Groceries)[2])')  # 169 initial store items  
+print(Groceries.n_baskets, Groceries.n_items())
+
+print(Groceries.n_baskets)  # 9835 market baskets for shopping trips
+print(Groceries.n_items())  # 169 initial store items
+
+# horizontal bar chart of item relative frequency (support)
+# for items at one level of the taxonomy with support of at least
+# min_support (level None for the initial store items)
+def item_frequency_plot(taxonomy, level, file_name, min_support = 0.025,\
+    xlim = (0, 0.3), color = 'darkred', fontsize = 8):
+    frequency = taxonomy.item_frequency(level)
+    item_names = taxonomy.item_names(level)
+    shown = np.flatnonzero(frequency >= min_support)
+    fig, axis = plt.subplots(figsize = (8.5, 11))
+    axis.barh(np.arange(len(shown)), frequency[shown], color = color)
+    axis.set_yticks(np.arange(len(shown)))
+    axis.set_yticklabels([item_names[item] for item in shown],\
+        fontsize = fontsize)
+    axis.invert_yaxis()
+    axis.set_xlim(xlim)
+    axis.set_xlabel('Proportion of Market Baskets Containing Item' +\
+        '\n(Item Relative Frequency or Support)')
+    plt.tight_layout()
+    plt.savefig(file_name)
+    plt.close(fig)
 
 # examine frequency for each item with support greater than 0.025
-r('pdf(file="fig_market_basket_initial_item_support.pdf", \
-    width = 8.5, height = 11)')
-r('itemFrequencyPlot(Groceries, support = 0.025, \
-    cex.names=0.8, xlim = c(0,0.3), \
-    type = "relative", horiz = TRUE, col = "dark red", las = 1, \
-    xlab = paste("Proportion of Market Baskets Containing Item", \
-      "\n(Item Relative Frequency or Support)"))')
-r('dev.off()')    
+item_frequency_plot(taxonomy, None,\
+    'fig_market_basket_initial_item_support.pdf')
 
 # explore possibilities for combining similar items
-r('print(head(itemInfo(Groceries)))') 
-r('print(levels(itemInfo(Groceries)[["level1"]]))')  # 10 levels... too few 
-r('print(levels(itemInfo(Groceries)[["level2"]]))')  # 55 distinct levels
+print(item_info.head())
+print(sorted(item_info['level1'].unique()))  # 10 levels... too few
+print(sorted(item_info['level2'].unique()))  # 55 distinct levels
 
 # aggregate items using the 55 level2 levels for food categories
 # to create a more meaningful set of items
-r('groceries <- aggregate(Groceries, itemInfo(Groceries)[["level2"]])')  
+groceries = taxonomy.transactions('level2')
 
-r('print(dim(groceries)[1])')  # 9835 market baskets for shopping trips
-r('print(dim(groceries)[2])')  # 55 final store items (categories)  
+print(groceries.n_baskets)  # 9835 market baskets for shopping trips
+print(groceries.n_items())  # 55 final store items (categories)
 
-r('pdf(file="fig_market_basket_final_item_support.pdf", \
-      width = 8.5, height = 11)')
-r('itemFrequencyPlot(groceries, support = 0.025, \
-       cex.names=1.0, xlim = c(0,0.5),\
-       type = "relative", horiz = TRUE, col = "blue", las = 1,\
-       xlab = paste("Proportion of Market Baskets Containing Item",\
-    "\n(Item Relative Frequency or Support)"))')
-r('dev.off()')   
+item_frequency_plot(taxonomy, 'level2',\
+    'fig_market_basket_final_item_support.pdf',\
+    xlim = (0, 0.5), color = 'blue', fontsize = 10)
 
 # obtain large set of association rules for items by category and all shoppers
 # this is done by setting very low criteria for support and confidence
-r('first.rules <- apriori(groceries, \
-       parameter = list(support = 0.001, confidence = 0.05))')
-r('print(summary(first.rules))')  # yields 69,921 rules... too many
-
-# select association rules using thresholds for support and confidence 
-r('second.rules <- apriori(groceries, \
-       parameter = list(support = 0.025, confidence = 0.05))')
-r('print(summary(second.rules))')  # yields 344 rules
-  
+# the rules are mined once, indexed by item, and saved... later
+# selections are queries against the stored rules
+rules = rule_store.build_rule_store(groceries,\
+    min_support = 0.001, min_confidence = 0.05)
+rules.save('groceries_rules.npz')
+# rules = rule_store.load_rule_store('groceries_rules.npz')  # later sessions
+first_rules = rules.query()
+print(len(first_rules))  # yields 69,921 rules... too many
+
+# select association rules using thresholds for support and confidence
+second_rules = rules.query(min_support = 0.025, min_confidence = 0.05)
+print(len(second_rules))  # yields 344 rules
+
 # data visualization of association rules in scatter plot
-r('pdf(file="fig_market_basket_rules.pdf", width = 8.5, height = 8.5)')
-r('plot(second.rules, \
-       control=list(jitter=2, col = rev(brewer.pal(9, "Greens")[4:9])), \
-  shading = "lift")')   
-r('dev.off()')    
-  
-# grouped matrix of rules 
-r('pdf(file="fig_market_basket_rules_matrix.pdf", \
-       width = 8.5, height = 8.5)')
-r('plot(second.rules, method="grouped", \
-       control=list(col = rev(brewer.pal(9, "Greens")[4:9])))')
-r('dev.off()')    
+fig, axis = plt.subplots(figsize = (8.5, 8.5))
+points = axis.scatter(second_rules.support, second_rules.confidence,\
+    c = second_rules.lift, cmap = 'Greens', edgecolors = 'gray')
+fig.colorbar(points, ax = axis, label = 'lift')
+axis.set_xlabel('support')
+axis.set_ylabel('confidence')
+plt.savefig('fig_market_basket_rules.pdf')
+plt.close(fig)
+
+# grouped matrix of rules, as with method = "grouped" in arulesViz:
+# antecedent (left-hand-side) item sets are clustered into n_groups by
+# k-means on their lift for each consequent, and each circle shows one
+# group and consequent, sized by total support and shaded by mean lift
+# groups are labeled by their rule count and most frequent items
+def grouped_matrix_plot(rules, file_name, n_groups = 20, cmap = 'Greens',\
+    random_state = 9999):
+    lhs_sets, lhs_of_rule = np.unique(rules.lhs, axis = 0,\
+        return_inverse = True)
+    rhs_items, rhs_of_rule = np.unique(rules.rhs, return_inverse = True)
+    profiles = np.zeros((len(lhs_sets), len(rhs_items)))
+    profiles[lhs_of_rule.ravel(), rhs_of_rule] = rules.lift
+    centroids, group_of_lhs = kmeans2(profiles,\
+        min(n_groups, len(lhs_sets)), minit = '++', seed = random_state)
+    group_of_rule = np.unique(group_of_lhs[lhs_of_rule.ravel()],\
+        return_inverse = True)[1]
+    shape = (group_of_rule.max() + 1, len(rhs_items))
+    n_rules = np.zeros(shape)
+    np.add.at(n_rules, (group_of_rule, rhs_of_rule), 1)
+    support = np.zeros(shape)
+    np.add.at(support, (group_of_rule, rhs_of_rule), rules.support)
+    lift = np.zeros(shape)
+    np.add.at(lift, (group_of_rule, rhs_of_rule), rules.lift)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        lift = lift / n_rules
+    # groups (columns) and consequents (rows) in decreasing mean lift
+    group_order = np.argsort(-np.nanmean(np.where(n_rules > 0, lift,\
+        np.nan), axis = 1), kind = 'mergesort')
+    rhs_order = np.argsort(-np.nanmean(np.where(n_rules > 0, lift,\
+        np.nan), axis = 0), kind = 'mergesort')
+    names = np.array(rules.item_names, dtype = object)
+    group_labels = []
+    for group in group_order:
+        item_counts = rules.lhs[group_of_rule == group].sum(axis = 0)
+        items = np.argsort(-item_counts, kind = 'mergesort')[:2]
+        items = items[item_counts[items] > 0]
+        others = np.count_nonzero(item_counts) - len(items)
+        group_labels.append(str(int(n_rules[group].sum())) + ' rules: {' +\
+            ', '.join(names[items]) + (', +' + str(others) + ' items'\
+            if others > 0 else '') + '}')
+    n_rules = n_rules[group_order][:, rhs_order]
+    support = support[group_order][:, rhs_order]
+    lift = lift[group_order][:, rhs_order]
+    column, row = np.nonzero(n_rules > 0)
+    fig, axis = plt.subplots(figsize = (8.5, 8.5))
+    points = axis.scatter(column, row,\
+        s = 500 * support[column, row] / support.max(),\
+        c = lift[column, row], cmap = cmap, edgecolors = 'gray')
+    fig.colorbar(points, ax = axis, label = 'lift')
+    axis.set_xticks(np.arange(len(group_order)))
+    axis.set_xticklabels(group_labels, rotation = 90, fontsize = 7)
+    axis.set_yticks(np.arange(len(rhs_order)))
+    axis.set_yticklabels(['{' + name + '}' for name in\
+        names[rhs_items[rhs_order]]], fontsize = 8)
+    axis.invert_yaxis()
+    axis.set_xlabel('LHS (groups of antecedents)')
+    axis.set_ylabel('RHS')
+    plt.tight_layout()
+    plt.savefig(file_name)
+    plt.close(fig)
+
+grouped_matrix_plot(second_rules, 'fig_market_basket_rules_matrix.pdf')
 
 # select rules with vegetables in consequent (right-hand-side) item subsets
-r('vegie.rules <- subset(second.rules, subset = rhs %pin% "vegetables")')
-r('inspect(vegie.rules)')  # 41 rules
+vegie_rules = rules.query(rhs = 'vegetables', partial = True,\
+    min_support = 0.025, min_confidence = 0.05)
+print(vegie_rules.to_data_frame())  # 41 rules
 
 # sort by lift and identify the top 10 rules
-r('top.vegie.rules <- head(sort(vegie.rules, \
-       decreasing = TRUE, by = "lift"), 10)')
-r('inspect(top.vegie.rules)') 
-
-r('pdf(file="fig_market_basket_farmer_rules.pdf", width = 11, height = 8.5)')
-r('plot(top.vegie.rules, method="graph", \
-       control=list(type="items"), \
-       shading = "lift")')
-r('dev.off()')  
+top_vegie_rules = rules.query(rhs = 'vegetables', partial = True,\
+    min_support = 0.025, min_confidence = 0.05, by = 'lift', top = 10)
+print(top_vegie_rules.to_data_frame())
+
+top_vegie_table = top_vegie_rules.to_data_frame()
+fig, axis = plt.subplots(figsize = (11, 8.5))
+axis.barh(np.arange(len(top_vegie_table)), top_vegie_table['lift'],\
+    color = 'darkgreen')
+axis.set_yticks(np.arange(len(top_vegie_table)))
+axis.set_yticklabels(top_vegie_table['lhs'] + ' => ' +\
+    top_vegie_table['rhs'])
+axis.invert_yaxis()
+axis.set_xlabel('lift')
+plt.tight_layout()
+plt.savefig('fig_market_basket_farmer_rules.pdf')
+plt.close(fig)
 
 # Suggestions for the student:
 # Suppose your client is someone other than the local farmer,
@@ -0,0 +1,34 @@
+# Item-to-Item Recommendations for Web Site Visits (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import os  # operating system interface for file paths
+
+# import user-defined module
+import web_visits
+
+# item-to-item recommendations for web site visits, a clickstream
+# benchmark from the Microsoft anonymous web data (Appendix C.2),
+# kept apart from the Groceries market baskets of Exhibit 9.2
+# users x pages matrices are read in one pass over the case-vote records
+data_directory = os.path.join('..', 'MDS_Appendix_C', 'MDS_Appendix_C_2')
+pages = web_visits.read_attributes(os.path.join(data_directory,\
+    'microsoft_attribute_data.csv'))
+training_visits = web_visits.read_visits(os.path.join(data_directory,\
+    'microsoft_training_data.csv'), pages)
+test_visits = web_visits.read_visits(os.path.join(data_directory,\
+    'microsoft_test_data.csv'), pages)
+print(training_visits.n_users(), training_visits.n_pages())  # 32711 294
+print(test_visits.n_users())  # 5000 test users
+
+# neighbors of each page from training users, and hit rate and latency
+# for test users with one visited page hidden
+recommender = web_visits.CooccurrenceRecommender(training_visits,\
+    n_neighbors = 20)
+for top in [3, 5, 10]:
+    hit_rate, latency = web_visits.evaluate_recommender(recommender,\
+        test_visits, top = top)
+    print('top', top, 'hit rate:', round(hit_rate, 3),\
+        'mean latency per user (microseconds):',\
+        round(1.0e6 * latency.mean(), 1))
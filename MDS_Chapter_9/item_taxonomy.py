@@ -0,0 +1,69 @@
+# Item Taxonomy for Bit-Packed Market Baskets (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# import user-defined module
+import market_basket
+
+# item hierarchy over one base set of transactions, as with itemInfo
+# and aggregate in arules: each level (a column of the item information
+# table, such as level1 or level2) maps item numbers to group numbers
+# through a lookup array, and the baskets containing a group are the OR
+# of the packed rows of its items... the base matrix is kept once, and
+# the transactions and item frequencies of each level are computed on
+# first use and cached, so mining and support plots at any level reuse
+# the same base matrix
+class ItemTaxonomy(object):
+
+    def __init__(self, transactions, item_info, labels = 'labels'):
+        self.base = transactions
+        self.item_info = item_info.set_index(labels)
+        self._lookups = {}
+        self._transactions = {}
+        self._frequencies = {}
+
+    # group names and the item -> group lookup array for a level
+    # (None for the base items)... items missing from the item
+    # information table are groups of their own
+    def lookup(self, level = None):
+        if level is None:
+            return(self.base.item_names, np.arange(self.base.n_items()))
+        if level not in self._lookups:
+            groups = self.item_info[level]
+            names = np.array([groups.get(name, name)\
+                for name in self.base.item_names], dtype = object)
+            group_names, codes = np.unique(names, return_inverse = True)
+            self._lookups[level] = (list(group_names), np.ravel(codes))
+        return(self._lookups[level])
+
+    def item_names(self, level = None):
+        return(self.lookup(level)[0])
+
+    # base item numbers in one group of a level
+    def members(self, level, group_name):
+        group_names, codes = self.lookup(level)
+        return(np.flatnonzero(codes == group_names.index(group_name)))
+
+    # transactions at a level, OR-ing the packed rows of the items of
+    # each group directly into the (groups x words) result
+    def transactions(self, level = None):
+        if level is None:
+            return(self.base)
+        if level not in self._transactions:
+            group_names, codes = self.lookup(level)
+            packed = np.zeros((len(group_names), self.base.packed.shape[1]),\
+                dtype = self.base.packed.dtype)
+            np.bitwise_or.at(packed, codes, self.base.packed)
+            self._transactions[level] = market_basket.Transactions(packed,\
+                self.base.n_baskets, group_names)
+        return(self._transactions[level])
+
+    # proportion of baskets containing each item (group) at a level
+    def item_frequency(self, level = None):
+        if level not in self._frequencies:
+            self._frequencies[level] = self.transactions(level).\
+                item_frequency()
+        return(self._frequencies[level])
@@ -0,0 +1,253 @@
+# Association Rules from Bit-Packed Market Baskets (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import multiprocessing  # process pool for itemset mining
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for rules
+
+# import user-defined module
+import process_pool
+
+# number of one bits in each byte value, for numpy without bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)],\
+    dtype = np.uint8)
+
+# number of one bits per 64-bit word
+def popcount(words):
+    words = np.asarray(words, dtype = np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return(np.bitwise_count(words))
+    counts = _BYTE_POPCOUNT[words.view(np.uint8)]
+    return(counts.reshape(words.shape + (8,)).sum(axis = -1))
+
+# number of one bits in each packed row
+def row_counts(packed):
+    return(popcount(packed).sum(axis = -1, dtype = np.int64))
+
+# transactions stored as a bit-packed item x basket matrix: bit b of
+# row i is set when basket b contains item i, with basket b in bit
+# b % 64 of word b // 64... the set of baskets containing an itemset
+# is the AND of its rows, and its support count is a popcount
+class Transactions(object):
+
+    def __init__(self, packed, n_baskets, item_names):
+        self.packed = packed
+        self.n_baskets = n_baskets
+        self.item_names = list(item_names)
+
+    def n_items(self):
+        return(self.packed.shape[0])
+
+    # number and proportion of baskets containing each item
+    def item_counts(self):
+        return(row_counts(self.packed))
+
+    def item_frequency(self):
+        return(self.item_counts() / self.n_baskets)
+
+    # item and basket numbers of every item in every basket
+    def pairs(self):
+        bits = np.unpackbits(self.packed.astype('<u8').view(np.uint8),\
+            axis = 1, bitorder = 'little')[:, :self.n_baskets]
+        items, baskets = np.nonzero(bits)
+        return(items, baskets)
+
+# transactions from parallel arrays of basket numbers and item numbers
+# (one entry per item in a basket, duplicates allowed)
+def from_pairs(baskets, items, n_baskets, item_names):
+    baskets = np.asarray(baskets, dtype = np.int64)
+    items = np.asarray(items, dtype = np.int64)
+    n_words = max(1, -(-n_baskets // 64))
+    packed = np.zeros((len(item_names), n_words), dtype = np.uint64)
+    np.bitwise_or.at(packed, (items, baskets // 64),\
+        np.left_shift(np.uint64(1), (baskets % 64).astype(np.uint64)))
+    return(Transactions(packed, n_baskets, item_names))
+
+# read baskets from a text file with one basket per line and items
+# separated by sep, as in the groceries.csv export of the Groceries data
+# items are numbered in sorted order of their names
+def read_baskets(file_name, sep = ','):
+    baskets = []
+    items = []
+    n_baskets = 0
+    with open(file_name) as source:
+        for line in source:
+            names = [name.strip().strip('"') for name in\
+                line.strip().split(sep) if name.strip()]
+            if not names:
+                continue
+            items.extend(names)
+            baskets.extend([n_baskets] * len(names))
+            n_baskets = n_baskets + 1
+    item_names, item_codes = np.unique(np.array(items, dtype = object),\
+        return_inverse = True)
+    return(from_pairs(baskets, item_codes, n_baskets, item_names))
+
+# export a transactions data set of the arules package (Groceries by
+# default) as a basket file for read_baskets and a table of item
+# information, through rpy2 with R and arules installed (the original
+# route of the market basket exhibit)
+def export_arules_data(basket_file = 'groceries.csv',\
+    item_info_file = 'groceries_item_info.csv', data_name = 'Groceries'):
+    from rpy2.robjects import r  # interface from Python to R
+    r('library(arules)')  # association rules
+    r('data(' + data_name + ')')
+    r('write(' + data_name + ', file = "' + basket_file +\
+        '", format = "basket", sep = ",")')
+    r('write.csv(itemInfo(' + data_name + '), file = "' + item_info_file +\
+        '", row.names = FALSE)')
+
+# packed item rows shared with worker processes
+_shared_packed = None
+
+def _share_packed(packed):
+    global _shared_packed
+    _shared_packed = packed
+
+# depth-first (Eclat) search below one prefix itemset: baskets of the
+# prefix are a packed bit row, and the support counts of all candidate
+# extensions are computed at once as popcounts of the prefix ANDed with
+# the candidate item rows... appends (items, count) to itemsets
+def _extend(packed, prefix, prefix_baskets, candidates, min_count,\
+    max_length, itemsets):
+    if len(prefix) >= max_length or len(candidates) == 0:
+        return
+    baskets = prefix_baskets[np.newaxis, :] & packed[candidates]
+    counts = row_counts(baskets)
+    frequent = np.flatnonzero(counts >= min_count)
+    for position, index in enumerate(frequent):
+        itemset = prefix + (int(candidates[index]),)
+        itemsets.append((itemset, int(counts[index])))
+        _extend(packed, itemset, baskets[index],\
+            candidates[frequent[position + 1:]], min_count, max_length,\
+            itemsets)
+
+def _mine_branch(task):
+    item, candidates, min_count, max_length = task
+    packed = _shared_packed
+    itemsets = []
+    _extend(packed, (item,), packed[item], candidates, min_count,\
+        max_length, itemsets)
+    return(itemsets)
+
+# frequent itemsets with support of at least min_support (a proportion
+# of baskets) and at most max_length items, by vertical (Eclat) mining
+# branches of the search (itemsets beginning with each frequent item)
+# are mined concurrently in a process pool
+# returns itemsets as a list of tuples of item numbers in increasing
+# order, with the empty itemset first, and their support counts
+def frequent_itemsets(transactions, min_support = 0.01, max_length = 10,\
+    n_jobs = None):
+    min_count = int(np.ceil(min_support * transactions.n_baskets - 1.0e-9))
+    item_counts = transactions.item_counts()
+    # frequent items in order of increasing support, which keeps the
+    # candidate lists short for the most frequent items
+    items = np.flatnonzero(item_counts >= min_count)
+    items = items[np.argsort(item_counts[items], kind = 'mergesort')]
+    tasks = [(int(item), items[position + 1:], min_count, max_length)\
+        for position, item in enumerate(items)]
+    if n_jobs is None:
+        n_jobs = process_pool.default_jobs()
+    n_jobs = max(1, min(n_jobs, len(tasks)))
+    if n_jobs == 1:
+        _share_packed(transactions.packed)
+        branches = [_mine_branch(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(processes = n_jobs,\
+            initializer = _share_packed, initargs = (transactions.packed,))
+        try:
+            branches = pool.map(_mine_branch, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    itemsets = [((), transactions.n_baskets)] +\
+        [((int(item),), int(item_counts[item])) for item in items]
+    for branch in branches:
+        itemsets.extend(branch)
+    counts = np.array([count for itemset, count in itemsets],\
+        dtype = np.int64)
+    return([tuple(sorted(itemset)) for itemset, count in itemsets], counts)
+
+# association rules with one item on the right-hand side, as from
+# arules apriori: each frequent itemset with k items gives k rules, the
+# left-hand side being the itemset less one item (empty for itemsets of
+# one item)... the left-hand side of every rule is itself a frequent
+# itemset, so its support count is a dictionary lookup, and support,
+# confidence, and lift are computed as array operations
+class Rules(object):
+
+    def __init__(self, lhs, rhs, counts, lhs_counts, rhs_counts,\
+        n_baskets, item_names):
+        self.lhs = lhs  # (rules x items) boolean membership
+        self.rhs = rhs  # item number
+        self.counts = counts
+        self.support = counts / n_baskets
+        self.confidence = counts / lhs_counts
+        self.lift = self.confidence / (rhs_counts / n_baskets)
+        self.n_baskets = n_baskets
+        self.item_names = list(item_names)
+
+    def __len__(self):
+        return(len(self.rhs))
+
+    # rules selected by a boolean mask or array of rule numbers
+    def subset(self, selected):
+        rules = Rules.__new__(Rules)
+        for name in ['lhs', 'rhs', 'counts', 'support', 'confidence',\
+            'lift']:
+            setattr(rules, name, getattr(self, name)[selected])
+        rules.n_baskets = self.n_baskets
+        rules.item_names = self.item_names
+        return(rules)
+
+    # rules in decreasing order of a measure ('lift', 'confidence',
+    # or 'support'), the first top rules when top is given
+    def sort(self, by = 'lift', top = None):
+        order = np.argsort(-getattr(self, by), kind = 'mergesort')
+        return(self.subset(order[:top]))
+
+    # rules as a DataFrame with item sets shown as in arules inspect
+    def to_data_frame(self):
+        names = np.array(self.item_names, dtype = object)
+        lhs = ['{' + ','.join(names[row]) + '}' for row in self.lhs]
+        rhs = ['{' + name + '}' for name in names[self.rhs]]
+        return(pd.DataFrame({'lhs': lhs, 'rhs': rhs,\
+            'support': self.support, 'confidence': self.confidence,\
+            'lift': self.lift}, columns = ['lhs', 'rhs', 'support',\
+            'confidence', 'lift']))
+
+def association_rules(transactions, min_support = 0.01,\
+    min_confidence = 0.5, max_length = 10, n_jobs = None, itemsets = None):
+    if itemsets is None:
+        itemsets = frequent_itemsets(transactions, min_support,\
+            max_length, n_jobs)
+    itemsets, counts = itemsets
+    count_of_itemset = dict(zip(itemsets, counts))
+    # one candidate rule per (itemset, member item)
+    source = []
+    rhs = []
+    lhs_counts = []
+    for row, itemset in enumerate(itemsets):
+        for position, item in enumerate(itemset):
+            source.append(row)
+            rhs.append(item)
+            lhs_counts.append(count_of_itemset[itemset[:position] +\
+                itemset[(position + 1):]])
+    source = np.array(source, dtype = np.int64)
+    rhs = np.array(rhs, dtype = np.int64)
+    lhs_counts = np.array(lhs_counts, dtype = np.int64)
+    rule_counts = counts[source]
+    keep = np.flatnonzero(\
+        (rule_counts / transactions.n_baskets >= min_support - 1.0e-12) &\
+        (rule_counts / lhs_counts >= min_confidence - 1.0e-12))
+    # boolean left-hand sides only for the rules kept
+    lhs = np.zeros((len(keep), transactions.n_items()), dtype = bool)
+    for row, rule in enumerate(keep):
+        lhs[row, list(itemsets[source[rule]])] = True
+    lhs[np.arange(len(keep)), rhs[keep]] = False
+    rhs_counts = transactions.item_counts()[rhs[keep]]
+    return(Rules(lhs, rhs[keep], rule_counts[keep], lhs_counts[keep],\
+        rhs_counts, transactions.n_baskets, transactions.item_names))
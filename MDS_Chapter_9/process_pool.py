@@ -0,0 +1,19 @@
+# Process Pool Size for Chapter Modules (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import multiprocessing  # start method and number of cores
+
+# worker processes when n_jobs is not given: every core (or one per
+# task, if fewer) when processes are started by fork, otherwise one,
+# meaning no pool at all... under spawn or forkserver (Windows, macOS,
+# and the Python 3.14 POSIX default) each worker re-imports the calling
+# script, and an exhibit without an if __name__ == '__main__' guard
+# would run again in every worker
+def default_jobs(n_tasks = None):
+    if multiprocessing.get_start_method() != 'fork':
+        return(1)
+    if n_tasks is None:
+        return(multiprocessing.cpu_count())
+    return(max(1, min(n_tasks, multiprocessing.cpu_count())))
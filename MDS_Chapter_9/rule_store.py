@@ -0,0 +1,123 @@
+# Indexed Store of Association Rules (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import numpy as np  # arrays and numerical processing
+
+# import user-defined module
+import market_basket
+
+# measures by which rules are kept in order within each item index
+INDEX_MEASURES = ['lift', 'confidence']
+
+# rules mined once at the lowest thresholds of interest and indexed by
+# item... for each measure, the rules with an item on the right-hand
+# side and the rules with an item on the left-hand side are kept as
+# lists of rule numbers sorted by the measure, stored end to end with
+# offsets for each item (as in a CSR matrix), so a query reads only the
+# rules of the items it names, already in order
+class RuleStore(object):
+
+    def __init__(self, rules, min_support, min_confidence):
+        self.rules = rules
+        self.min_support = min_support
+        self.min_confidence = min_confidence
+        n_items = len(rules.item_names)
+        self.indexes = {}
+        self.orders = {}
+        for measure in INDEX_MEASURES:
+            values = getattr(rules, measure)
+            self.orders[measure] = np.argsort(-values, kind = 'mergesort')
+            lhs_rules, lhs_items = np.nonzero(rules.lhs)
+            for side, rule_ids, items in [\
+                ('rhs', np.arange(len(rules)), rules.rhs),\
+                ('lhs', lhs_rules, lhs_items)]:
+                order = np.lexsort((rule_ids, -values[rule_ids], items))
+                offsets = np.concatenate([[0], np.cumsum(np.bincount(\
+                    items, minlength = n_items))])
+                self.indexes[(side, measure)] = (rule_ids[order], offsets)
+
+    # item numbers for item names, with partial matching (as with
+    # %pin% in arules) when partial is True
+    def items(self, names, partial = False):
+        if isinstance(names, str):
+            names = [names]
+        if partial:
+            return([item for item, item_name in\
+                enumerate(self.rules.item_names)\
+                if any(name in item_name for name in names)])
+        return([self.rules.item_names.index(name) for name in names])
+
+    def _indexed_rules(self, side, items, by):
+        rule_ids, offsets = self.indexes[(side, by)]
+        return(np.concatenate([rule_ids[offsets[item]:offsets[item + 1]]\
+            for item in items] + [np.zeros(0, dtype = rule_ids.dtype)]))
+
+    # rules meeting the support and confidence thresholds, with any of the
+    # rhs items on the right-hand side and any of the lhs items on the
+    # left-hand side (names, or parts of names when partial is True),
+    # in decreasing order of by ('lift' or 'confidence'), the first top
+    # rules when top is given
+    def query(self, rhs = None, lhs = None, min_support = None,\
+        min_confidence = None, by = 'lift', top = None, partial = False):
+        if min_support is None:
+            min_support = self.min_support
+        if min_confidence is None:
+            min_confidence = self.min_confidence
+        if min_support < self.min_support - 1.0e-12 or\
+            min_confidence < self.min_confidence - 1.0e-12:
+            print('\nRuleStore.query error: thresholds below those',\
+                'used to mine the stored rules\n')
+            return(None)
+        if by not in INDEX_MEASURES:
+            print('\nRuleStore.query error: by must be lift or confidence\n')
+            return(None)
+        values = getattr(self.rules, by)
+        sides = [(side, self.items(names, partial)) for side, names in\
+            [('rhs', rhs), ('lhs', lhs)] if names is not None]
+        selections = [self._indexed_rules(side, items, by)\
+            for side, items in sides]
+        if not selections:
+            candidates = self.orders[by]
+        elif len(sides) == 1 and len(sides[0][1]) == 1:
+            # one item: its index list is already in order
+            candidates = selections[0]
+        else:
+            candidates = np.unique(selections[0])
+            for selection in selections[1:]:
+                candidates = np.intersect1d(candidates, selection)
+            candidates = candidates[np.argsort(-values[candidates],\
+                kind = 'mergesort')]
+        keep = (self.rules.support[candidates] >= min_support - 1.0e-12) &\
+            (self.rules.confidence[candidates] >= min_confidence - 1.0e-12)
+        return(self.rules.subset(candidates[keep][:top]))
+
+    # save the rules (the indexes are rebuilt on loading)
+    def save(self, file_name):
+        np.savez_compressed(file_name, lhs = self.rules.lhs,\
+            rhs = self.rules.rhs, counts = self.rules.counts,\
+            support = self.rules.support,\
+            confidence = self.rules.confidence, lift = self.rules.lift,\
+            n_baskets = self.rules.n_baskets,\
+            item_names = np.array(self.rules.item_names, dtype = str),\
+            thresholds = np.array([self.min_support, self.min_confidence]))
+
+# mine rules once at the lowest thresholds and index them
+def build_rule_store(transactions, min_support = 0.001,\
+    min_confidence = 0.05, max_length = 10, n_jobs = None):
+    rules = market_basket.association_rules(transactions, min_support,\
+        min_confidence, max_length, n_jobs)
+    return(RuleStore(rules, min_support, min_confidence))
+
+# rule store from a file written by RuleStore.save
+def load_rule_store(file_name):
+    with np.load(file_name) as saved:
+        rules = market_basket.Rules.__new__(market_basket.Rules)
+        for name in ['lhs', 'rhs', 'counts', 'support', 'confidence',\
+            'lift']:
+            setattr(rules, name, saved[name])
+        rules.n_baskets = int(saved['n_baskets'])
+        rules.item_names = [str(name) for name in saved['item_names']]
+        min_support, min_confidence = saved['thresholds']
+    return(RuleStore(rules, float(min_support), float(min_confidence)))
@@ -0,0 +1,152 @@
+# Web Site Visits and Item-to-Item Recommendations (Python)
+
+# prepare for Python version 3x features and functions
+from __future__ import division, print_function
+
+import csv  # reading case-vote records
+import time  # scoring latency
+
+import numpy as np  # arrays and numerical processing
+import pandas as pd  # DataFrame structure for page attributes
+from scipy import sparse  # sparse user x page matrices
+
+# page attributes (vroots) from records of the form
+#   A,page_id,ignored,title,url
+# returns a DataFrame with page_id, title, and url sorted by page_id
+def read_attributes(file_name):
+    rows = []
+    with open(file_name) as source:
+        for record in csv.reader(source):
+            if record and record[0] == 'A':
+                rows.append((int(record[1]), record[3], record[4]))
+    attributes = pd.DataFrame(rows, columns = ['page_id', 'title', 'url'])
+    return(attributes.sort_values('page_id').reset_index(drop = True))
+
+# users and the pages they visited, as a CSR user x page matrix with a
+# row per case (user) and a column per page in the order of the page
+# attributes
+class WebVisits(object):
+
+    def __init__(self, matrix, user_ids, attributes):
+        self.matrix = matrix
+        self.user_ids = user_ids
+        self.attributes = attributes
+
+    def n_users(self):
+        return(self.matrix.shape[0])
+
+    def n_pages(self):
+        return(self.matrix.shape[1])
+
+    def page_titles(self, columns):
+        return(list(self.attributes['title'].values[columns]))
+
+# read case-vote (C/V) records in one streaming pass, as in the
+# Microsoft anonymous web data: a C record begins each case (user), and
+# each V record that follows is one page the user visited... page
+# numbers go to columns through a lookup array over page ids, and the
+# CSR arrays are built directly from the records
+def read_visits(file_name, attributes):
+    page_ids = attributes['page_id'].values
+    column_of_page = np.full(page_ids.max() + 1, -1, dtype = np.int64)
+    column_of_page[page_ids] = np.arange(len(page_ids))
+    user_ids = []
+    indptr = [0]
+    pages = []
+    with open(file_name) as source:
+        for record in csv.reader(source):
+            if not record:
+                continue
+            if record[0] == 'C':
+                if user_ids:
+                    indptr.append(len(pages))
+                user_ids.append(int(record[1]))
+            elif record[0] == 'V':
+                pages.append(int(record[1]))
+    if user_ids:
+        indptr.append(len(pages))
+    pages = np.array(pages, dtype = np.int64)
+    if len(pages) and (pages.max() >= len(column_of_page) or\
+        (column_of_page[pages] < 0).any()):
+        print('\nread_visits error: pages not in the page attributes\n')
+        return(None)
+    matrix = sparse.csr_matrix((np.ones(len(pages), dtype = np.float32),\
+        column_of_page[pages], np.array(indptr, dtype = np.int64)),\
+        shape = (len(user_ids), len(page_ids)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return(WebVisits(matrix, np.array(user_ids, dtype = np.int64),\
+        attributes))
+
+# item-to-item recommendations from page co-occurrence: the similarity
+# of two pages is the number of users visiting both divided by the
+# geometric mean of their numbers of visitors (cosine similarity), and
+# only the n_neighbors most similar pages of each page are kept, as a
+# sparse page x page matrix computed once... the scores of a batch of
+# users are one sparse product of their visits with the neighbor matrix
+class CooccurrenceRecommender(object):
+
+    def __init__(self, visits, n_neighbors = 20):
+        matrix = visits.matrix
+        cooccurrence = sparse.csr_matrix(matrix.T.dot(matrix))
+        cooccurrence.setdiag(0)
+        cooccurrence.eliminate_zeros()
+        visitors = np.sqrt(np.asarray(matrix.sum(axis = 0)).ravel())
+        coo = cooccurrence.tocoo()
+        similarity = coo.data / (visitors[coo.row] * visitors[coo.col])
+        # n_neighbors largest similarities of each page (row)
+        order = np.lexsort((-similarity, coo.row))
+        rows = coo.row[order]
+        starts = np.searchsorted(rows, rows, side = 'left')
+        keep = order[(np.arange(len(order)) - starts) < n_neighbors]
+        self.neighbors = sparse.csr_matrix((similarity[keep],\
+            (coo.row[keep], coo.col[keep])), shape = cooccurrence.shape)
+        self.n_neighbors = n_neighbors
+
+    # top pages for each row of a CSR user x page matrix, excluding
+    # pages already visited, scored in batches of batch_size users
+    # returns a (users x top) array of page columns (-1 where a user has
+    # fewer than top pages with positive scores)
+    def recommend(self, matrix, top = 5, batch_size = 1000):
+        matrix = sparse.csr_matrix(matrix)
+        recommended = np.full((matrix.shape[0], top), -1, dtype = np.int64)
+        for begin in range(0, matrix.shape[0], batch_size):
+            batch = matrix[begin:(begin + batch_size)]
+            scores = batch.dot(self.neighbors).toarray()
+            scores[batch.nonzero()] = 0
+            columns = np.argsort(-scores, axis = 1, kind = 'mergesort')[:,\
+                :top]
+            found = np.take_along_axis(scores, columns, axis = 1) > 0
+            recommended[begin:(begin + batch_size)] =\
+                np.where(found, columns, -1)
+        return(recommended)
+
+# leave-one-out evaluation on held-out users: for each user with at
+# least two visits, one page visited (chosen at random) is hidden,
+# recommendations are made from the other pages, and a hit is the
+# hidden page among the top recommendations... returns the hit rate and
+# the scoring latency per user in seconds (the time for each batch
+# divided by its users)
+def evaluate_recommender(recommender, visits, top = 5, batch_size = 1000,\
+    random_state = 9999):
+    counts = np.diff(visits.matrix.indptr)
+    users = np.flatnonzero(counts >= 2)
+    # hidden page: a random position within each user's row
+    rng = np.random.RandomState(random_state)
+    shown = visits.matrix[users]
+    hidden_positions = shown.indptr[:-1] +\
+        (rng.random_sample(len(users)) * counts[users]).astype(np.int64)
+    hidden = shown.indices[hidden_positions].copy()
+    shown.data[hidden_positions] = 0
+    shown.eliminate_zeros()
+    hits = np.zeros(len(users), dtype = bool)
+    latency = np.zeros(len(users))
+    for begin in range(0, len(users), batch_size):
+        end = min(begin + batch_size, len(users))
+        start = time.time()
+        recommended = recommender.recommend(shown[begin:end], top,\
+            batch_size)
+        latency[begin:end] = (time.time() - start) / (end - begin)
+        hits[begin:end] = (recommended == hidden[begin:end,\
+            np.newaxis]).any(axis = 1)
+    return(hits.mean(), latency)